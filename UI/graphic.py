@@ -5,9 +5,11 @@ from tkinter.simpledialog import askstring
 from tkinter.messagebox import showinfo
 import tkinter.filedialog as fd
 from datetime import datetime
+from functools import cached_property
 
 from config import config
 from UI.settings import Settings
+from UI.worker import Worker
 from api.metin2wiki import Metin2Wiki
 from api.mediawiki import BotManagement, Bot
 
@@ -67,7 +69,14 @@ class WikiApp(tk.Tk):
         self.defaultFont = font.nametofont("TkDefaultFont") 
         self.defaultFont.configure(size=12)
 
+        self.worker = Worker(self, on_callback_error=self._on_callback_error)
         self.create_frames()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+    def close(self):
+        self.worker.close()
+        self.metin2wiki.close()
+        self.destroy()
 
     def create_frames(self):
         self.settings = Settings()
@@ -82,9 +91,13 @@ class WikiApp(tk.Tk):
         self.menu_bar = MenuBar(self, self.main_frame)
         self.config(menu=self.menu_bar)
 
+    def _on_callback_error(self, err: Exception):
+        self.console_frame.write(f"An error occurs: {err!r}")
+
     def delete_frames(self):
         for child in self.winfo_children():
             child.destroy()
+        self.metin2wiki.close()
 
     def change_settings(self, key, value):
         self.settings[key] = value
@@ -102,22 +115,35 @@ class WikiAppMixin:
         self.wiki_app = wiki_app
         self.console_frame = wiki_app.console_frame
         self.metin2wiki = wiki_app.metin2wiki
+        self.worker = wiki_app.worker
 
     def write_in_console(self, text):
         self.console_frame.write(text)
 
+    def run_in_background(self, function, *args, on_success=None, on_error=None):
+        self.worker.submit(
+            function,
+            *args,
+            on_success=on_success,
+            on_error=on_error or self.write_in_console,
+        )
+
 
 class MainFrame(tk.Frame):
     def __init__(self, master: WikiApp):
         tk.Frame.__init__(self, master)
 
+        self.wiki_app = master
         self.default_frame = DefaultFrame(self)
         self.default_frame.pack(fill=tk.BOTH)
 
         self.current_frame = self.default_frame
 
         self.bot_managing_frame = BotManagingFrame(self, master)
-        self.short_pages_frame = ShortPagesFrame(self, master)
+
+    @cached_property
+    def short_pages_frame(self):
+        return ShortPagesFrame(self, self.wiki_app)
 
 
 class MenuBar(tk.Menu, WikiAppMixin):
@@ -378,77 +404,181 @@ class BotManagingFrame(tk.Frame, WikiAppMixin):
         self.write_in_console(f"Trying connexion to Metin2Wiki with the bot {bot_name}...")
 
         self.wiki_app.metin2wiki.set_bot(bot=new_bot)
-        try:
-            self.wiki_app.metin2wiki.login()
-        except ConnectionError as err:
-            self.write_in_console(err)
-        else:
-            self.write_in_console(f"Sucess! The bot {bot_name} is now saved.")
-            self.bot_management.save_new_bot(new_bot=new_bot)
-            self._add_new_bot(new_bot=new_bot)
+        self.run_in_background(
+            self.wiki_app.metin2wiki.login,
+            on_success=lambda _: self._on_login(new_bot),
+        )
+
+    def _on_login(self, new_bot: Bot):
+        self.write_in_console(f"Sucess! The bot {new_bot.name} is now saved.")
+        self.bot_management.save_new_bot(new_bot=new_bot)
+        self._add_new_bot(new_bot=new_bot)
 
 
 class ShortPagesFrame(tk.Frame, WikiAppMixin):
     NAME = "Short pages tool"
+    DELETE_REASON = "Page without any content"
+    COLUMNS = {"title": "Title", "pageid": "Page id"}
+    NUMERIC_COLUMNS = ("pageid",)
 
     def __init__(self, master: MainFrame, wiki_app: WikiApp):
         tk.Frame.__init__(self, master, padx=10, pady=10)
         WikiAppMixin.__init__(self, wiki_app)
 
-        self.short_pages = self.metin2wiki.short_pages()
+        self.short_pages = {}
+        self.sort_reverse = {column: False for column in self.COLUMNS}
+        self.deleting = False
 
         title_label = tk.Label(self, text=self.NAME, font=("Helvetica", 16, "bold"))
         title_label.pack(pady=10)
 
+        self.status_label = tk.Label(self, text="Loading short pages...")
+        self.status_label.pack()
+
         self._create_table()
+        self._create_buttons()
+
+        self.worker.stream(
+            self.metin2wiki.iter_short_pages,
+            on_item=self._add_page,
+            on_done=self._update_status,
+            on_error=self.write_in_console,
+        )
 
-        # button = tk.Button(
-        #     self,
-        #     text="Delete",
-        #     **BUTTON_STYLE,
-        #     **BUTTON_ADD_STYLE,
-        #     command=self._delete_short_pages,
-        # )
-        # button.pack(fill=tk.BOTH)
+    def _update_status(self):
+        self.status_label.configure(text=f"{len(self.short_pages)} short page(s).")
 
     def _create_table(self):
-        for page in self.short_pages:
-            page_frame = tk.Frame(self)
-            page_title = tk.Text(page_frame, height=1, width=20, wrap=tk.WORD)
-            page_title.insert(tk.INSERT, page.title)
-            page_title.configure(state="disabled")
-            page_title.grid(row=0, column=0, sticky="we")
-
-            delete_button = ttk.Button(
-                page_frame,
-                text="Delete 🗑️",
-                command=lambda: self._delete_page(page_frame, page),
+        table_frame = tk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.tree = ttk.Treeview(
+            table_frame,
+            columns=list(self.COLUMNS),
+            show="headings",
+            selectmode="extended",
+        )
+
+        for column, heading in self.COLUMNS.items():
+            self.tree.heading(
+                column,
+                text=heading,
+                command=lambda column=column: self._sort_by(column),
             )
-            delete_button.grid(row=0, column=1, sticky="we")
-            page_frame.columnconfigure(0, weight=10)
-            page_frame.columnconfigure(1, weight=1)
-            page_frame.pack(fill=tk.X)
+
+        self.tree.column("title", stretch=True)
+        self.tree.column("pageid", width=100, stretch=False, anchor=tk.E)
+
+        scrollbar = ttk.Scrollbar(
+            table_frame, orient=tk.VERTICAL, command=self.tree.yview
+        )
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    def _create_buttons(self):
+        buttons_frame = tk.Frame(self)
+        buttons_frame.pack(fill=tk.X, pady=10)
+
+        delete_selected_button = tk.Button(
+            buttons_frame,
+            text="Delete selected 🗑️",
+            **BUTTON_ADD_STYLE,
+            command=self._delete_selected_pages,
+        )
+        delete_selected_button.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
         delete_all_button = tk.Button(
-            self,
+            buttons_frame,
             text="Delete all",
             **BUTTON_ADD_STYLE,
             command=self._delete_all_pages,
         )
-        delete_all_button.pack(fill=tk.BOTH, pady=10)
+        delete_all_button.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+    def _add_page(self, page):
+        iid = str(page.key)
+
+        if iid in self.short_pages:
+            return
 
-    def _delete_page(self, page_frame: tk.Frame, page):
+        self.short_pages[iid] = page
+        self.tree.insert("", tk.END, iid=iid, values=(page.title, page.pageid or ""))
+
+    def _remove_page(self, page):
+        iid = str(page.key)
+
+        if self.short_pages.pop(iid, None) is not None:
+            self.tree.delete(iid)
+            self._update_status()
+
+    def _sort_by(self, column: str):
+        reverse = self.sort_reverse[column]
+        rows = [
+            (self.tree.set(iid, column), iid) for iid in self.tree.get_children("")
+        ]
+
+        if column in self.NUMERIC_COLUMNS:
+            rows.sort(key=lambda row: int(row[0] or 0), reverse=reverse)
+        else:
+            rows.sort(key=lambda row: row[0].lower(), reverse=reverse)
+
+        for index, (_, iid) in enumerate(rows):
+            self.tree.move(iid, "", index)
+
+        self.sort_reverse[column] = not reverse
+
+    def _delete_pages(self, pages: list):
+        if self.deleting:
+            self.write_in_console("A deletion is already running.")
+            return
+
+        self.deleting = True
+        self.write_in_console(f"Deleting {len(pages)} page(s)...")
+        self.worker.stream(
+            self._run_deletion,
+            pages,
+            on_item=self._handle_deletion,
+            on_done=self._on_deletion_end,
+            on_error=self._on_deletion_error,
+        )
+
+    def _run_deletion(self, pages: list):
         self.metin2wiki.login()
-        try:
-            page.delete("Page without any content")
-        except Exception:
-            self.write_in_console(f"An error occurs. The page {page.title} cannot be deleted.")
+        yield from self.metin2wiki.bulk_delete(pages, reason=self.DELETE_REASON)
+
+    def _on_deletion_end(self):
+        self.deleting = False
+        self.write_in_console("Deletion finished.")
+
+    def _on_deletion_error(self, err: Exception):
+        self.deleting = False
+        self.write_in_console(f"An error occurs during deletion: {err}")
+
+    def _handle_deletion(self, result: tuple):
+        page, request_result = result
+
+        if request_result is None:
+            self.write_in_console(
+                f"The page {page.title} has backlinks and was not deleted."
+            )
+        elif "error" in request_result:
+            self.write_in_console(
+                f"The page {page.title} cannot be deleted: {request_result['error']['info']}"
+            )
         else:
             self.write_in_console(f"The page {page.title} was successfully deleted")
-            page_frame.destroy()
-            self.short_pages.remove(page)
+            self._remove_page(page)
+
+    def _delete_selected_pages(self):
+        pages = [self.short_pages[iid] for iid in self.tree.selection()]
+
+        if not pages:
+            self.write_in_console("No page selected.")
+            return
+
+        self._delete_pages(pages)
 
     def _delete_all_pages(self):
-        self.write_in_console("Delete all button isn't implemented yet.")
-        for page in self.short_pages:
-            pass
\ No newline at end of file
+        self._delete_pages(list(self.short_pages.values()))
\ No newline at end of file
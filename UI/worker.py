@@ -0,0 +1,96 @@
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from queue import Empty, Queue
+
+
+class Worker:
+    POLL_DELAY = 100
+    MAX_CALLBACKS = 200
+    MAX_WORKERS = 2
+
+    def __init__(
+        self, root: tk.Misc, max_workers: int = MAX_WORKERS, on_callback_error=None
+    ):
+        self.root = root
+        self.on_callback_error = on_callback_error
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.callbacks = Queue()
+        self.running = 0
+        self.closed = False
+
+    def close(self):
+        # Running streams stop at their next item, queued tasks are dropped.
+        self.closed = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, function, *args, on_success=None, on_error=None):
+        self._start(self._call, function, args, on_success, on_error)
+
+    def stream(self, function, *args, on_item=None, on_done=None, on_error=None):
+        self._start(self._iterate, function, args, on_item, on_done, on_error)
+
+    def _start(self, task, *args):
+        self.running += 1
+        self.executor.submit(copy_context().run, task, *args)
+
+        if self.running == 1:
+            self.root.after(self.POLL_DELAY, self._poll)
+
+    def _put(self, callback, *args):
+        if callback is not None:
+            self.callbacks.put((callback, args))
+
+    def _call(self, function, args, on_success, on_error):
+        try:
+            result = function(*args)
+        except Exception as err:
+            self._put(on_error, err)
+        else:
+            self._put(on_success, result)
+        finally:
+            self.callbacks.put(None)
+
+    def _iterate(self, function, args, on_item, on_done, on_error):
+        try:
+            for item in function(*args):
+                if self.closed:
+                    return
+
+                self._put(on_item, item)
+        except Exception as err:
+            self._put(on_error, err)
+        else:
+            self._put(on_done)
+        finally:
+            self.callbacks.put(None)
+
+    def _run_callback(self, callback, args):
+        try:
+            callback(*args)
+        except tk.TclError:
+            # The widget waiting for this result was destroyed.
+            pass
+        except Exception as err:
+            if self.on_callback_error is not None:
+                self.on_callback_error(err)
+
+    def _poll(self):
+        if self.closed:
+            return
+
+        try:
+            for _ in range(self.MAX_CALLBACKS):
+                try:
+                    message = self.callbacks.get_nowait()
+                except Empty:
+                    break
+
+                if message is None:
+                    self.running -= 1
+                    continue
+
+                self._run_callback(*message)
+        finally:
+            if not self.closed and (self.running or not self.callbacks.empty()):
+                self.root.after(self.POLL_DELAY, self._poll)
@@ -0,0 +1,117 @@
+import os
+from threading import Lock
+
+from config import config
+from utils.utils import bounded_map, text_hash
+
+
+class EditJournal:
+    SEPARATOR = "\t"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = Lock()
+        self.done = self._read()
+
+    def _read(self) -> set[tuple[int, str]]:
+        done = set()
+
+        try:
+            with open(self.path, "r") as file:
+                for line in file:
+                    # A crash during record can leave the last line truncated.
+                    if not line.endswith("\n"):
+                        continue
+
+                    try:
+                        pageid, hash_ = line[:-1].split(self.SEPARATOR)
+                        done.add((int(pageid), hash_))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+
+        return done
+
+    def has(self, pageid: int, hash_: str) -> bool:
+        return (pageid, hash_) in self.done
+
+    def record(self, pageid: int, hash_: str):
+        with self.lock:
+            with open(self.path, "a") as file:
+                file.write(f"{pageid}{self.SEPARATOR}{hash_}\n")
+            self.done.add((pageid, hash_))
+
+    def clear(self):
+        with self.lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.done = set()
+
+
+class BulkEdit:
+    UNCHANGED = "unchanged"
+    ALREADY_DONE = "already done"
+    EDITED = "edited"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        mediawiki,
+        journal_path: str = config.EDIT_JOURNAL_PATH,
+        max_workers: int | None = None,
+    ):
+        self.mediawiki = mediawiki
+        self.journal = EditJournal(journal_path)
+        self.max_workers = max_workers or mediawiki.max_workers
+
+    def _edit(self, args):
+        page, hash_, summary = args
+
+        try:
+            request_result = self.mediawiki.edit(page=page, summary=summary)
+        except ConnectionError as err:
+            return page, self.FAILED, str(err)
+
+        if request_result.get("edit", {}).get("result") != "Success":
+            return page, self.FAILED, request_result.get("error", {}).get("info")
+
+        self.journal.record(page.pageid, hash_)
+
+        return page, self.EDITED, None
+
+    def _to_edit(self, pages, summary: str, skipped: list):
+        for page in pages:
+            hash_ = text_hash(page.text)
+
+            if hash_ == page.fetched_hash:
+                skipped.append((page, self.UNCHANGED, None))
+            elif self.journal.has(page.pageid, hash_):
+                skipped.append((page, self.ALREADY_DONE, None))
+            else:
+                yield page, hash_, summary
+
+    def run(self, pages, summary=""):
+        if self.mediawiki.csrf_token is None:
+            self.mediawiki.csrf_token = self.mediawiki.get_csrf_token()
+
+        skipped = []
+        failed = False
+
+        results = bounded_map(
+            self.mediawiki.executor,
+            self._edit,
+            self._to_edit(pages, summary, skipped),
+            self.max_workers,
+        )
+
+        for result in results:
+            yield from skipped
+            skipped.clear()
+            failed |= result[1] == self.FAILED
+            yield result
+
+        yield from skipped
+
+        if not failed:
+            self.journal.clear()
@@ -0,0 +1,53 @@
+import sqlite3
+from threading import Lock
+
+from utils.utils import data_slicing
+
+
+class RevisionCache:
+    MAX_VARIABLES = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS revisions (
+                pageid INTEGER PRIMARY KEY,
+                revid INTEGER NOT NULL,
+                content TEXT NOT NULL
+            )
+            """
+        )
+
+    def get(self, pageids) -> dict[int, tuple[int, str]]:
+        result = {}
+
+        with self.lock:
+            for pageids_slice in data_slicing(pageids, self.MAX_VARIABLES):
+                placeholders = ",".join("?" * len(pageids_slice))
+                rows = self.connection.execute(
+                    f"SELECT pageid, revid, content FROM revisions WHERE pageid IN ({placeholders})",
+                    pageids_slice,
+                )
+                result.update((pageid, (revid, content)) for pageid, revid, content in rows)
+
+        return result
+
+    def save(self, pages):
+        rows = [
+            (page.pageid, page.revid, page.text)
+            for page in pages
+            if page.revid is not None
+        ]
+
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO revisions (pageid, revid, content) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
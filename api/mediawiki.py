@@ -2,9 +2,17 @@ import requests
 import time
 import json
 from json import JSONEncoder
-
-from models.page import Page, Pages
-from utils.utils import data_slicing
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from requests.adapters import HTTPAdapter
+
+from api.bulk import BulkEdit
+from api.cache import RevisionCache
+from api.metrics import RequestMetrics
+from models.page import REVISION_PARAMS, Page, Pages, revision_content
+from utils.utils import data_slicing, bounded_map
 from config import config
 
 
@@ -99,21 +107,161 @@ class BotManagement:
         return sum(1 for _ in self)
 
 
+class TokenBucket:
+    def __init__(self, rate: float | None, capacity: float = 1, max_rate=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_rate = max_rate
+        self.min_rate = rate / 16 if rate else None
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = Lock()
+
+    def acquire(self):
+        if self.rate is None:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+
+    def set_rate(self, rate: float, capacity: float):
+        with self.lock:
+            self.rate = rate
+            self.max_rate = rate
+            self.min_rate = rate / 16
+            self.capacity = capacity
+            self.tokens = min(self.tokens, capacity)
+
+    def speed_up(self):
+        if self.rate is None or self.max_rate is None:
+            return
+
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate * 1.1)
+
+    def slow_down(self):
+        if self.rate is None:
+            return
+
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0)
+
+
+class RequestScheduler:
+    MAX_RETRIES = 5
+    BASE_DELAY = 1
+    MAX_DELAY = 60
+    RETRY_CODES = ("maxlag", "ratelimited", "unavailable")
+    RETRY_STATUS = (429, 502, 503, 504)
+    DEFAULT_RATES = {
+        "edit": (2, 10),
+        "delete": (2, 10),
+    }
+
+    def __init__(self, max_retries: int = MAX_RETRIES):
+        self.max_retries = max_retries
+        self.buckets: dict[str, TokenBucket] = {}
+        self.lock = Lock()
+
+    def bucket(self, action: str) -> TokenBucket:
+        with self.lock:
+            if action not in self.buckets:
+                rate, max_rate = self.DEFAULT_RATES.get(action, (None, None))
+                self.buckets[action] = TokenBucket(rate, max_rate=max_rate)
+            return self.buckets[action]
+
+    def set_rate_limits(self, ratelimits: dict):
+        for action, limits in ratelimits.items():
+            rate, hits = min(
+                (limit["hits"] / limit["seconds"], limit["hits"])
+                for limit in limits.values()
+            )
+            self.bucket(action).set_rate(rate, capacity=hits)
+
+    def acquire(self, action: str):
+        self.bucket(action).acquire()
+
+    def success(self, action: str):
+        self.bucket(action).speed_up()
+
+    def retry_delay(self, action: str, attempt: int, error: dict, headers) -> float:
+        if error["code"] == "ratelimited":
+            self.bucket(action).slow_down()
+
+        retry_after = self._retry_after(headers.get("Retry-After"))
+
+        if retry_after is not None:
+            delay = retry_after
+        elif error["code"] == "maxlag" and "lag" in error:
+            delay = float(error["lag"])
+        else:
+            delay = self.BASE_DELAY * 2**attempt
+
+        return min(max(delay, self.BASE_DELAY), self.MAX_DELAY)
+
+    def _retry_after(self, value: str | None) -> float | None:
+        # Retry-After is either a number of seconds or an HTTP date.
+        if value is None:
+            return None
+
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+
+        return (date - datetime.now(timezone.utc)).total_seconds()
+
+
 class MediaWiki:
     MAX_URL_LENGTH = 8213
     MAX_PARAMS = 500
     MAX_LAG = 1
+    MAX_WORKERS = 4
+    TIMEOUT = (10, 60)
+    FORMAT_VERSION = "2"
+    ACCEPT_ENCODING = "gzip"
 
     def __init__(
         self,
         api_url: str,
         bot: Bot,
+        max_workers: int = MAX_WORKERS,
+        cache_path: str | None = None,
+        max_lag: int = MAX_LAG,
+        max_retries: int = RequestScheduler.MAX_RETRIES,
+        metrics: RequestMetrics | None = None,
+        timeout: float | tuple[float, float] = TIMEOUT,
     ):
         self.api_url = api_url
+        self.timeout = timeout
         self.bot = bot
         self.csrf_token = None
         self.logged = False
+        self.max_workers = max_workers
+        self.max_lag = max_lag
+        self.scheduler = RequestScheduler(max_retries=max_retries)
         self.session = self._new_session()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.cache = self._new_cache(cache_path)
+        self.metrics = metrics
 
     def set_bot(self, bot: Bot):
         self.bot = bot
@@ -122,7 +270,33 @@ class MediaWiki:
         self.session = self._new_session()
 
     def _new_session(self):
-        return requests.session()
+        session = requests.session()
+        session.headers["Accept-Encoding"] = self.ACCEPT_ENCODING
+        adapter = HTTPAdapter(pool_maxsize=self.max_workers, pool_block=True)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    def _new_cache(self, cache_path: str | None):
+        if cache_path is not None:
+            return RevisionCache(cache_path)
+
+    def set_cache(self, cache_path: str | None):
+        if self.cache is not None:
+            self.cache.close()
+        self.cache = self._new_cache(cache_path)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+        self.set_cache(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def _check_params(self, params: list | None, type_: str):
         def check_type_names(el):
@@ -147,12 +321,133 @@ class MediaWiki:
 
         return data_slicing(params, self.MAX_PARAMS)
 
+    def _read_response(self, response: requests.Response) -> dict:
+        if response.status_code in self.scheduler.RETRY_STATUS:
+            return {
+                "error": {
+                    "code": "unavailable",
+                    "info": f"HTTP error {response.status_code}",
+                }
+            }
+
+        try:
+            return response.json()
+        except ValueError:
+            return {
+                "error": {
+                    "code": "invalidresponse",
+                    "info": f"Invalid response (HTTP {response.status_code})",
+                }
+            }
+
+    def _send(self, method: str, query_params: dict) -> dict:
+        query_params = {
+            "formatversion": self.FORMAT_VERSION,
+            **query_params,
+            "maxlag": self.max_lag,
+        }
+        action = query_params.get("action", "query")
+
+        for attempt in range(self.scheduler.max_retries + 1):
+            self.scheduler.acquire(action)
+            start = time.perf_counter()
+
+            try:
+                if method == "GET":
+                    response = self.session.get(
+                        url=self.api_url, params=query_params, timeout=self.timeout
+                    )
+                else:
+                    response = self.session.post(
+                        self.api_url, data=query_params, timeout=self.timeout
+                    )
+            except requests.RequestException as err:
+                # Timeouts and dropped connections are retried like a 503.
+                response = None
+                request_result = {"error": {"code": "unavailable", "info": repr(err)}}
+            else:
+                request_result = self._read_response(response)
+
+            error = request_result.get("error", {})
+
+            if self.metrics is not None:
+                self._record_metrics(query_params, start, response, error.get("code"))
+
+            if error.get("code") not in self.scheduler.RETRY_CODES:
+                self.scheduler.success(action)
+                return request_result
+
+            if attempt < self.scheduler.max_retries:
+                if self.metrics is not None:
+                    self.metrics.record_retry(self._request_type(query_params))
+                headers = {} if response is None else response.headers
+                time.sleep(self.scheduler.retry_delay(action, attempt, error, headers))
+
+        raise ConnectionError(
+            f"{action} failed after {self.scheduler.max_retries} retries: {error['info']}"
+        )
+
+    def _request_type(self, query_params: dict) -> str:
+        modules = [
+            query_params[module]
+            for module in ("meta", "list", "generator", "prop")
+            if module in query_params
+        ]
+
+        return ":".join([query_params.get("action", "query"), *modules])
+
+    def _wire_size(self, response: requests.Response) -> int:
+        if hasattr(response.raw, "tell") and response.raw.tell():
+            return response.raw.tell()
+
+        return int(response.headers.get("Content-Length", len(response.content)))
+
+    def _record_metrics(
+        self,
+        query_params: dict,
+        start: float,
+        response: requests.Response | None,
+        error_code,
+    ):
+        latency = time.perf_counter() - start
+        action = self._request_type(query_params)
+
+        if response is None:
+            self.metrics.record(action, latency, 0, 0, error_code=error_code)
+            return
+
+        request = response.request
+        body = request.body or b""
+
+        self.metrics.record(
+            action=action,
+            latency=latency,
+            bytes_out=len(request.url) + len(body),
+            bytes_in=len(response.content),
+            error_code=error_code,
+            bytes_in_wire=self._wire_size(response),
+        )
+
     def wiki_request(self, query_params: dict) -> dict:
-        query_params["maxlag"] = self.MAX_LAG
-        return self.session.get(url=self.api_url, params=query_params).json()
+        return self._send("GET", query_params)
+
+    def _continued_requests(self, query_params: dict):
+        while True:
+            request_result = self.wiki_request(query_params)
+            yield request_result
+
+            if "continue" not in request_result:
+                return
+
+            query_params = {**query_params, **request_result["continue"]}
+
+    def wiki_requests(self, queries):
+        return bounded_map(
+            self.executor, self.wiki_request, queries, self.max_workers
+        )
 
     def wiki_post(self, query_params: dict) -> dict:
-        return self.session.post(self.api_url, data=query_params).json()
+        return self._send("POST", query_params)
 
     def login(self):
 
@@ -185,6 +480,19 @@ class MediaWiki:
             raise ConnectionError(result["login"]["reason"])
         else:
             self.logged = True
+            self.scheduler.set_rate_limits(self.get_rate_limits())
+
+    def get_rate_limits(self) -> dict:
+        query_params = {
+            "action": "query",
+            "meta": "userinfo",
+            "uiprop": "ratelimits",
+            "format": "json",
+        }
+
+        request_result = self.wiki_request(query_params)
+
+        return request_result["query"]["userinfo"].get("ratelimits", {})
 
     def get_csrf_token(self) -> str:
         query_params = {
@@ -213,22 +521,81 @@ class MediaWiki:
             "cmtype": "page",
         }
 
-        def request(query_params, pages):
-            request_result = self.wiki_request(query_params)
+        return [
+            Page(self, page["title"], page["pageid"])
+            for request_result in self._continued_requests(query_params)
+            for page in request_result["query"]["categorymembers"]
+        ]
 
-            cmcontinue = request_result.get("continue", False)
+    def _category_members_params(self, category: str) -> dict:
+        return {
+            "action": "query",
+            "format": "json",
+            "generator": "categorymembers",
+            "gcmtitle": f"Category:{category}",
+            "gcmlimit": "max",
+            "gcmtype": "page",
+        }
+
+    def category_info(self, category: str):
+        query_params = self._category_members_params(category)
+        query_params["prop"] = "info"
+
+        for request_result in self._continued_requests(query_params):
+            yield request_result.get("query", {}).get("pages", [])
+
+    def cached_content(self, pages_info, parse=False):
+        outdated_pageids = []
+
+        for page_infos in pages_info:
+            page_infos = [page for page in page_infos if "missing" not in page]
+            cached = self.cache.get(page["pageid"] for page in page_infos)
 
-            pages += request_result["query"]["categorymembers"]
+            for page_info in page_infos:
+                pageid = page_info["pageid"]
+                revid, content = cached.get(pageid, (None, None))
 
-            if cmcontinue:
-                query_params["cmcontinue"] = cmcontinue["cmcontinue"]
-                request(query_params, pages)
+                if revid != page_info["lastrevid"]:
+                    outdated_pageids.append(pageid)
+                    continue
 
-            return pages
+                yield Page(
+                    self,
+                    title=page_info["title"],
+                    pageid=pageid,
+                    content=content,
+                    parse=parse,
+                    revid=revid,
+                )
 
-        pages = request(query_params, [])
+        yield from Pages(self, outdated_pageids).iter_revisions(parse)
 
-        return [Page(self, page["title"], page["pageid"]) for page in pages]
+    def category_content(self, category: str, parse=False):
+        if self.cache is not None:
+            yield from self.cached_content(self.category_info(category), parse)
+            return
+
+        query_params = self._category_members_params(category)
+        query_params.update(REVISION_PARAMS)
+
+        for request_result in self._continued_requests(query_params):
+            for page in request_result.get("query", {}).get("pages", []):
+                if "revisions" not in page:
+                    continue
+
+                yield Page(
+                    self,
+                    title=page["title"],
+                    pageid=page["pageid"],
+                    content=revision_content(page["revisions"][0]),
+                    parse=parse,
+                    revid=page["revisions"][0]["revid"],
+                )
+
+    def categories(self, categories: list[str]):
+        pages = bounded_map(self.executor, self.category, categories, self.max_workers)
+
+        return [page for category_pages in pages for page in category_pages]
 
     def edit(self, page: Page, summary=""):
         if self.csrf_token is None:
@@ -242,21 +609,86 @@ class MediaWiki:
             "bot": "true",
             "minor": "true",
             "summary": summary,
-            "text": str(page.content),
+            "text": page.text,
         }
 
         request_result = self.wiki_post(query_params)
 
         if "error" in request_result:
-            if request_result["error"]["code"] == "ratelimited":
-                time.sleep(5)
-                self.edit(page=page, summary=summary)
+            print(request_result["error"]["info"])
+        else:
+            print(f"{page.title} modified.")
+
+        return request_result
+
+    def bulk_edit(self, pages, summary="", journal_path=config.EDIT_JOURNAL_PATH):
+        return BulkEdit(self, journal_path=journal_path).run(pages, summary=summary)
+
+    def _backlinks_queries(self, pages: list[Page]):
+        pageids = [page.pageid for page in pages if page.pageid is not None]
+        titles = [page.title for page in pages if page.pageid is None]
+
+        for batch in self._check_params(pageids, "ids") or []:
+            yield {"pageids": "|".join(map(str, batch))}
+
+        for batch in self._check_params(titles, "names") or []:
+            yield {"titles": "|".join(batch)}
+
+    def _linkshere(self, batch_params: dict) -> list[dict]:
+        query_params = {
+            "action": "query",
+            "format": "json",
+            "prop": "linkshere",
+            "lhprop": "pageid|title",
+            "lhlimit": "max",
+            **batch_params,
+        }
+
+        pages = []
+
+        for request_result in self._continued_requests(query_params):
+            query = request_result.get("query", {})
+            normalized = {
+                title["to"]: title["from"] for title in query.get("normalized", [])
+            }
+
+            for page in query.get("pages", []):
+                page["title"] = normalized.get(page["title"], page["title"])
+                pages.append(page)
 
-        print(f"{page.title} modified.")
+        return pages
 
-    def delete(self, page: Page, reason=""):
-        if len(page.backlinks) != 0:
-            print(f"Page {page.title} has {len(page.backlinks)} backlinks.")
+    def backlinks(self, pages: list[Page]) -> dict[int | str, list[Page]]:
+        pages = list(pages)
+        backlinks = {page.key: [] for page in pages}
+
+        results = bounded_map(
+            self.executor,
+            self._linkshere,
+            self._backlinks_queries(pages),
+            self.max_workers,
+        )
+
+        for batch in results:
+            for page in batch:
+                key = page.get("pageid")
+
+                if key not in backlinks:
+                    key = page["title"]
+
+                backlinks.setdefault(key, []).extend(
+                    Page(self, link["title"], link["pageid"])
+                    for link in page.get("linkshere", [])
+                )
+
+        return backlinks
+
+    def delete(self, page: Page, reason="", backlinks: list[Page] | None = None):
+        if backlinks is None:
+            backlinks = page.backlinks
+
+        if len(backlinks) != 0:
+            print(f"Page {page.title} has {len(backlinks)} backlinks.")
             return
 
         if self.csrf_token is None:
@@ -279,23 +711,51 @@ class MediaWiki:
         request_result = self.wiki_post(query_params)
 
         if "error" in request_result:
-            if request_result["error"]["code"] == "permissiondenied":
-                print(request_result["error"]["info"])
-
+            print(request_result["error"]["info"])
         else:
             print(f"{page.title} deleted.")
 
-    def short_pages(self):
-        query_params = {
-            "action": "query",
-            "format": "json",
-            "list": "allpages",
-            "aplimit": "500",
-            "apmaxsize": "0",
-        }
+        return request_result
 
-        request_result = self.wiki_request(query_params)
+    def bulk_delete(self, pages, reason=""):
+        pages = list(pages)
+        backlinks = self.backlinks(pages)
+
+        if self.csrf_token is None:
+            self.csrf_token = self.get_csrf_token()
+
+        def delete(page: Page):
+            return page, self.delete(page, reason=reason, backlinks=backlinks[page.key])
+
+        yield from bounded_map(self.executor, delete, pages, self.max_workers)
+
+    def iter_short_pages(
+        self,
+        max_size: int = 0,
+        min_size: int | None = None,
+        namespaces: tuple[int, ...] = (0,),
+    ):
+        for namespace in namespaces:
+            query_params = {
+                "action": "query",
+                "format": "json",
+                "list": "allpages",
+                "aplimit": "max",
+                "apnamespace": namespace,
+                "apmaxsize": max_size,
+            }
 
-        pages = request_result["query"]["allpages"]
+            if min_size is not None:
+                query_params["apminsize"] = min_size
 
-        return [Page(self, page["title"], page["pageid"]) for page in pages]
\ No newline at end of file
+            for request_result in self._continued_requests(query_params):
+                for page in request_result.get("query", {}).get("allpages", []):
+                    yield Page(self, page["title"], page["pageid"])
+
+    def short_pages(
+        self,
+        max_size: int = 0,
+        min_size: int | None = None,
+        namespaces: tuple[int, ...] = (0,),
+    ):
+        return list(self.iter_short_pages(max_size, min_size, namespaces))
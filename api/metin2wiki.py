@@ -1,10 +1,24 @@
+import numpy as np
+import polars as pl
+
 from api.mediawiki import MediaWiki, Bot
+from api.metrics import RequestMetrics
+from config import config
 
 
 class Metin2Wiki(MediaWiki):
     ALPHABET = "abcdefghijklmnopqrstuvwxyz"
     ALPHABET += ALPHABET.upper()
     BASE = len(ALPHABET)
+    MAX_CODE_LENGTH = 11
+    SEPARATOR = "\n"
+
+    CODE_TABLE = {letter: value for value, letter in enumerate(ALPHABET)}
+    ALPHABET_BYTES = np.frombuffer(ALPHABET.encode(), dtype=np.uint8)
+    LETTER_VALUES = np.full(256, -1, dtype=np.int64)
+    LETTER_VALUES[0] = 0
+    LETTER_VALUES[ALPHABET_BYTES] = np.arange(BASE)
+    POWERS = BASE ** np.arange(MAX_CODE_LENGTH, dtype=np.int64)
 
     BASE_URL = "https://{lang}-wiki.metin2.gameforge.com/api.php"
 
@@ -12,18 +26,30 @@ class Metin2Wiki(MediaWiki):
         self,
         lang="fr",
         bot: Bot = None,
+        max_workers: int = MediaWiki.MAX_WORKERS,
+        use_cache: bool = True,
+        metrics: RequestMetrics | None = None,
     ):
+        self.use_cache = use_cache
         super().__init__(
             api_url=self.construct_api_url(lang=lang),
             bot=bot,
+            max_workers=max_workers,
+            cache_path=self.construct_cache_path(lang=lang),
+            metrics=metrics,
         )
         self.lang = lang
 
     def construct_api_url(self, lang: str):
         return self.BASE_URL.format(lang=lang)
+
+    def construct_cache_path(self, lang: str):
+        if self.use_cache:
+            return config.REVISION_CACHE_PATH.format(lang=lang)
     
     def change_lang(self, new_lang: str):
         self.api_url = self.construct_api_url(lang=new_lang)
+        self.set_cache(self.construct_cache_path(lang=new_lang))
         self.lang = new_lang
 
     def vnum_conversion(self, number: int):
@@ -42,7 +68,72 @@ class Metin2Wiki(MediaWiki):
         number = 0
 
         for i, letter in enumerate(letters):
-            value = self.ALPHABET.index(letter)
-            number += value * (self.BASE**i)
+            if letter not in self.CODE_TABLE:
+                raise ValueError(f"{letter} isn't a valid code letter.")
+            number += self.CODE_TABLE[letter] * (self.BASE**i)
 
         return number
+
+    def vnums_to_codes(self, vnums):
+        numbers = np.asarray(vnums, dtype=np.int64)
+
+        if (numbers < 0).any():
+            raise ValueError("Vnums must be positive.")
+
+        lengths = np.maximum(1, np.searchsorted(self.POWERS, numbers, side="right"))
+        digits = numbers[:, None] // self.POWERS % self.BASE
+
+        # One separator column after the letters, so every code can be
+        # split out of a single ASCII buffer.
+        letters = np.full(
+            (len(numbers), self.MAX_CODE_LENGTH + 1), ord(self.SEPARATOR), np.uint8
+        )
+        letters[:, : self.MAX_CODE_LENGTH] = self.ALPHABET_BYTES[digits]
+        keep = np.arange(self.MAX_CODE_LENGTH + 1) < lengths[:, None]
+        keep[:, self.MAX_CODE_LENGTH] = True
+
+        buffer = letters[keep][:-1].tobytes().decode("ascii")
+        name = vnums.name if isinstance(vnums, pl.Series) else ""
+        codes = pl.Series(name, [buffer]).str.split(self.SEPARATOR).explode()
+
+        if not len(numbers):
+            codes = codes.clear()
+
+        if isinstance(vnums, pl.Series):
+            return codes
+
+        return codes.to_numpy()
+
+    def codes_to_vnums(self, codes):
+        series = codes if isinstance(codes, pl.Series) else pl.Series(list(codes))
+
+        if series.dtype != pl.String:
+            series = series.cast(pl.String)
+
+        if series.null_count():
+            raise ValueError("Codes can't be null.")
+
+        lengths = series.str.len_bytes().to_numpy().astype(np.int64)
+        width = int(lengths.max()) if len(lengths) else 0
+
+        if width > self.MAX_CODE_LENGTH:
+            raise ValueError(f"Codes can't be longer than {self.MAX_CODE_LENGTH}.")
+
+        buffer = series.str.concat(self.SEPARATOR).item() or ""
+        letters = np.frombuffer(buffer.encode(), dtype=np.uint8)
+        starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+
+        positions = np.arange(width)
+        valid = positions < lengths[:, None]
+        indices = np.where(valid, starts[:, None] + positions, 0)
+        values = np.where(valid, self.LETTER_VALUES[letters[indices]], 0)
+
+        if (values < 0).any():
+            raise ValueError("Codes must only contain letters from the alphabet.")
+
+        vnums = values @ self.POWERS[:width]
+
+        if isinstance(codes, pl.Series):
+            return pl.Series(codes.name, vnums, dtype=pl.Int64)
+
+        return vnums
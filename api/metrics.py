@@ -0,0 +1,114 @@
+import json
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+# Context-local, so concurrent jobs on other threads keep their own name.
+# Executor tasks get it through contextvars.copy_context (see bounded_map).
+_current_job = ContextVar("current_job", default=None)
+
+
+class RequestMetrics:
+    DEFAULT_JOB = "default"
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self):
+        self.lock = Lock()
+        self.stats = {}
+
+    @property
+    def current_job(self) -> str:
+        return _current_job.get() or self.DEFAULT_JOB
+
+    @contextmanager
+    def job(self, name: str):
+        token = _current_job.set(name)
+        try:
+            yield self
+        finally:
+            _current_job.reset(token)
+
+    def _new_stats(self) -> dict:
+        return {
+            "requests": 0,
+            "retries": 0,
+            "bytes_out": 0,
+            "bytes_in": 0,
+            "bytes_in_wire": 0,
+            "latency_total": 0.0,
+            "latency_max": 0.0,
+            "latency_histogram": [0] * (len(self.LATENCY_BUCKETS) + 1),
+            "errors": {},
+        }
+
+    def _action_stats(self, action: str) -> dict:
+        job_stats = self.stats.setdefault(self.current_job, {})
+
+        if action not in job_stats:
+            job_stats[action] = self._new_stats()
+
+        return job_stats[action]
+
+    def record(
+        self,
+        action: str,
+        latency: float,
+        bytes_out: int,
+        bytes_in: int,
+        error_code: str | None = None,
+        bytes_in_wire: int | None = None,
+    ):
+        with self.lock:
+            stats = self._action_stats(action)
+            stats["requests"] += 1
+            stats["bytes_out"] += bytes_out
+            stats["bytes_in"] += bytes_in
+            stats["bytes_in_wire"] += (
+                bytes_in if bytes_in_wire is None else bytes_in_wire
+            )
+            stats["latency_total"] += latency
+            stats["latency_max"] = max(stats["latency_max"], latency)
+            stats["latency_histogram"][bisect_left(self.LATENCY_BUCKETS, latency)] += 1
+
+            if error_code is not None:
+                stats["errors"][error_code] = stats["errors"].get(error_code, 0) + 1
+
+    def record_retry(self, action: str):
+        with self.lock:
+            self._action_stats(action)["retries"] += 1
+
+    def summary(self) -> dict:
+        with self.lock:
+            summary = {}
+
+            for job, job_stats in self.stats.items():
+                summary[job] = {}
+
+                for action, stats in job_stats.items():
+                    summary[job][action] = {
+                        **stats,
+                        "errors": dict(stats["errors"]),
+                        "latency_histogram": dict(
+                            zip(
+                                [*map(str, self.LATENCY_BUCKETS), "inf"],
+                                stats["latency_histogram"],
+                            )
+                        ),
+                        "bytes_saved": stats["bytes_in"] - stats["bytes_in_wire"],
+                        "latency_mean": (
+                            stats["latency_total"] / stats["requests"]
+                            if stats["requests"]
+                            else 0.0
+                        ),
+                    }
+
+            return summary
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+
+    def dump(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.summary(), file, indent=4)
@@ -0,0 +1,136 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from api.bulk import BulkEdit
+from api.mediawiki import Bot, MediaWiki
+from api.metrics import RequestMetrics
+from benchmarks.server import StandInServer, WikiData
+
+
+class ClientBenchmark:
+    CATEGORY = WikiData.CATEGORY
+    SUMMARY = "Benchmark"
+
+    def __init__(self, server: StandInServer, max_workers: int = MediaWiki.MAX_WORKERS):
+        self.server = server
+        self.metrics = RequestMetrics()
+        self.mediawiki = MediaWiki(
+            api_url=server.url,
+            bot=Bot(name="Benchmark", password="benchmark"),
+            max_workers=max_workers,
+            metrics=self.metrics,
+        )
+        self.results = {}
+
+    def _measure(self, name: str, function) -> dict:
+        with self.metrics.job(name), contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            items = function()
+            duration = time.perf_counter() - start
+
+        self.results[name] = {
+            "items": items,
+            "seconds": duration,
+            "items_per_second": items / duration if duration else 0.0,
+        }
+
+        return self.results[name]
+
+    def bench_login(self) -> int:
+        self.mediawiki.login()
+        return 1
+
+    def bench_category(self) -> int:
+        return len(self.mediawiki.category(self.CATEGORY))
+
+    def bench_pages_content(self) -> int:
+        pageids = self.server.data.sorted_pageids()
+        return len(self.mediawiki.pages(pageids).content())
+
+    def bench_category_content(self) -> int:
+        return sum(1 for _ in self.mediawiki.category_content(self.CATEGORY))
+
+    def bench_bulk_edit(self) -> int:
+        pages = []
+
+        for page in self.mediawiki.category_content(self.CATEGORY):
+            if page.text:
+                page.content = page.text + "\n"
+                pages.append(page)
+
+        with tempfile.TemporaryDirectory() as directory:
+            results = self.mediawiki.bulk_edit(
+                pages,
+                summary=self.SUMMARY,
+                journal_path=os.path.join(directory, "edit_journal.txt"),
+            )
+            return sum(status == BulkEdit.EDITED for _, status, _ in results)
+
+    def bench_short_pages(self) -> int:
+        return len(self.mediawiki.short_pages())
+
+    def bench_bulk_delete(self) -> int:
+        pages = self.mediawiki.short_pages()
+
+        return sum(
+            request_result is not None and "delete" in request_result
+            for _, request_result in self.mediawiki.bulk_delete(
+                pages, reason=self.SUMMARY
+            )
+        )
+
+    def run(self) -> dict:
+        for name in (
+            "login",
+            "category",
+            "pages_content",
+            "category_content",
+            "bulk_edit",
+            "short_pages",
+            "bulk_delete",
+        ):
+            self._measure(name, getattr(self, f"bench_{name}"))
+
+        return {"results": self.results, "metrics": self.metrics.summary()}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the MediaWiki client against a local stand-in server."
+    )
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--content-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=MediaWiki.MAX_WORKERS)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--maxlag-rate", type=float, default=0.0)
+    parser.add_argument("--ratelimit-rate", type=float, default=0.0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    data = WikiData(pages=args.pages, content_size=args.content_size)
+    server = StandInServer(
+        data=data,
+        latency=args.latency,
+        maxlag_rate=args.maxlag_rate,
+        ratelimit_rate=args.ratelimit_rate,
+    )
+
+    with server:
+        report = ClientBenchmark(server, max_workers=args.workers).run()
+
+    report["parameters"] = vars(args)
+
+    if args.output is None:
+        print(json.dumps(report, indent=4))
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
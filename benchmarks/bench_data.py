@@ -0,0 +1,208 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from api.metin2wiki import Metin2Wiki
+from config.config import ITEM_PROTO_PATH, MOB_PROTO_PATH
+from data.cache import ArrowCache
+from data.read_files import GameNames, GameProto
+
+
+def scale_proto(path: str, destination: str, factor: int):
+    with open(path, "rb") as file:
+        header, *lines = file.read().splitlines()
+
+    vnums = [line.split(b"\t", 1)[0] for line in lines]
+    offset = max(int(vnum) for vnum in vnums if vnum.isdigit()) + 1
+
+    with open(destination, "wb") as file:
+        file.write(header + b"\n")
+
+        for copy in range(factor):
+            for vnum, line in zip(vnums, lines):
+                if copy and vnum.isdigit():
+                    line = str(int(vnum) + copy * offset).encode() + line[len(vnum) :]
+                file.write(line + b"\n")
+
+
+# Polars and Arrow allocate outside the Python heap that tracemalloc sees,
+# so the process RSS is sampled from a thread while a stage runs.
+class PeakRss:
+    INTERVAL = 0.005
+
+    def __init__(self):
+        self.process = None if psutil is None else psutil.Process()
+        self.start = self.peak = None
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _update(self):
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def _sample(self):
+        while not self.stop.wait(self.INTERVAL):
+            self._update()
+
+    def __enter__(self):
+        if self.process is not None:
+            self.start = self.peak = self.process.memory_info().rss
+            self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        if self.process is not None:
+            self.stop.set()
+            self.thread.join()
+            self._update()
+
+    def result(self) -> dict:
+        return {
+            "peak_rss_bytes": self.peak,
+            "rss_growth_bytes": None if self.peak is None else self.peak - self.start,
+        }
+
+
+class DataBenchmark:
+    LANG = "fr"
+
+    def __init__(
+        self,
+        directory: str,
+        mob_path: str = MOB_PROTO_PATH,
+        item_path: str = ITEM_PROTO_PATH,
+        names: bool = True,
+    ):
+        self.directory = directory
+        self.mob_path = mob_path
+        self.item_path = item_path
+        self.names = names
+        self.metin2wiki = Metin2Wiki(lang=self.LANG, use_cache=False)
+
+    def _time(self, function) -> dict:
+        with PeakRss() as rss:
+            start = time.perf_counter()
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                function()
+
+            seconds = time.perf_counter() - start
+
+        return {"seconds": seconds, **rss.result()}
+
+    def _memory(self, function) -> dict:
+        tracemalloc.start()
+
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {"python_heap_peak_bytes": peak}
+
+    def _stages(self, cache: ArrowCache) -> dict:
+        game_proto = GameProto(cache, mob_path=self.mob_path, item_path=self.item_path)
+        result_path = os.path.join(self.directory, "monster_data.txt")
+        state = {}
+
+        def load_mob():
+            state["vnums"] = game_proto.mob[GameProto.VNUM]
+
+        def vnums_to_codes():
+            state["codes"] = self.metin2wiki.vnums_to_codes(state["vnums"])
+
+        stages = {
+            "game_proto_mob": load_mob,
+            "game_proto_item": lambda: game_proto.item,
+            "save_mob_data_for_calculator": lambda: (
+                game_proto.save_mob_data_for_calculator(
+                    tuple(state["vnums"]), path=result_path
+                )
+            ),
+            "vnums_to_codes": vnums_to_codes,
+            "codes_to_vnums": lambda: self.metin2wiki.codes_to_vnums(state["codes"]),
+            "vnum_conversion_loop": lambda: [
+                self.metin2wiki.vnum_conversion(vnum) for vnum in state["vnums"]
+            ],
+        }
+
+        if self.names:
+            stages["game_names"] = lambda: GameNames(lang=self.LANG, cache=cache)
+
+        return stages
+
+    def _run_pass(self, cache: ArrowCache, measure) -> dict:
+        return {
+            name: measure(function) for name, function in self._stages(cache).items()
+        }
+
+    def _run_passes(self, cache_name: str, measure) -> dict:
+        cache = ArrowCache(os.path.join(self.directory, cache_name))
+
+        return {
+            "cold": self._run_pass(cache, measure),
+            "warm": self._run_pass(cache, measure),
+        }
+
+    def run(self) -> dict:
+        # Memory is measured in a separate pass on its own cache, so that
+        # tracemalloc doesn't slow down the timed stages.
+        timings = self._run_passes("timing_cache", self._time)
+        memory = self._run_passes("memory_cache", self._memory)
+
+        for state, stages in timings.items():
+            for name, stage in stages.items():
+                stage.update(memory[state][name])
+
+            stages["total_seconds"] = sum(stage["seconds"] for stage in stages.values())
+
+        return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark proto, names and codec loading on the data files."
+    )
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    report = {"parameters": vars(args), "scales": {}}
+
+    for scale in args.scales:
+        # Cached Arrow files may still be memory-mapped on Windows.
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as directory:
+            mob_path, item_path = MOB_PROTO_PATH, ITEM_PROTO_PATH
+
+            if scale != 1:
+                mob_path = os.path.join(directory, "mob_proto.txt")
+                item_path = os.path.join(directory, "item_proto.txt")
+                scale_proto(MOB_PROTO_PATH, mob_path, scale)
+                scale_proto(ITEM_PROTO_PATH, item_path, scale)
+
+            benchmark = DataBenchmark(
+                directory, mob_path=mob_path, item_path=item_path, names=scale == 1
+            )
+            report["scales"][str(scale)] = benchmark.run()
+
+    if args.output is None:
+        print(json.dumps(report, indent=4))
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
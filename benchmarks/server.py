@@ -0,0 +1,457 @@
+import gzip
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from urllib.parse import parse_qsl, urlsplit
+
+
+class WikiData:
+    CATEGORY = "Monstres"
+    MAX_LIMIT = 500
+    RATE_LIMITS = {
+        "edit": {"user": {"hits": 100000, "seconds": 60}},
+        "delete": {"user": {"hits": 100000, "seconds": 60}},
+    }
+
+    def __init__(
+        self,
+        pages: int = 1000,
+        content_size: int = 2000,
+        short_every: int = 10,
+        backlinks_every: int = 25,
+    ):
+        self.lock = Lock()
+        self.pages = {}
+        self.titles = {}
+
+        for pageid in range(1, pages + 1):
+            title = f"Page {pageid}"
+            size = 0 if pageid % short_every == 0 else content_size
+            self.pages[pageid] = {
+                "pageid": pageid,
+                "ns": 0,
+                "title": title,
+                "revid": pageid,
+                "content": self._content(pageid, size),
+                "backlinks": (
+                    list(range(1, pageid % 7 + 1))
+                    if pageid % backlinks_every == 0
+                    else []
+                ),
+            }
+            self.titles[title] = pageid
+
+    def _content(self, pageid: int, size: int) -> str:
+        if not size:
+            return ""
+
+        infobox = f"{{{{Monstres\n| Niveau = {pageid % 120}\n}}}}\n"
+
+        return infobox + "x" * max(size - len(infobox), 0)
+
+    def limit(self, value: str | None) -> int:
+        if value in (None, "max"):
+            return self.MAX_LIMIT
+        return min(int(value), self.MAX_LIMIT)
+
+    def sorted_pageids(self) -> list[int]:
+        with self.lock:
+            return sorted(self.pages)
+
+    def get(self, pageid: int) -> dict | None:
+        with self.lock:
+            return self.pages.get(pageid)
+
+    def edit(self, pageid: int, content: str) -> dict | None:
+        with self.lock:
+            page = self.pages.get(pageid)
+
+            if page is not None:
+                page["content"] = content
+                page["revid"] += len(self.pages)
+
+            return page
+
+    def delete(self, pageid: int) -> dict | None:
+        with self.lock:
+            page = self.pages.pop(pageid, None)
+
+            if page is not None:
+                self.titles.pop(page["title"], None)
+
+            return page
+
+
+class WikiHandler(BaseHTTPRequestHandler):
+    server: "StandInServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle(dict(parse_qsl(urlsplit(self.path).query)))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self._handle(dict(parse_qsl(self.rfile.read(length).decode())))
+
+    def _handle(self, params: dict):
+        server = self.server
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        error = server.injected_error()
+
+        if error is not None:
+            self._send({"error": error}, headers={"Retry-After": server.retry_after})
+            return
+
+        action = params.get("action", "query")
+        handler = getattr(self, f"_action_{action}", None)
+
+        if handler is None:
+            result = {"error": {"code": "badvalue", "info": f"Unknown {action}."}}
+        else:
+            result = handler(params)
+
+        self._send(result)
+
+    def _send(self, result: dict, headers: dict | None = None):
+        body = json.dumps(result).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+
+        if self.server.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+
+        self.send_header("Content-Length", str(len(body)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _formatversion(self, params: dict) -> int:
+        return int(params.get("formatversion", 1))
+
+    def _pages_result(self, pages: list[dict], params: dict):
+        if self._formatversion(params) == 2:
+            return pages
+        return {str(page.get("pageid", -1)): page for page in pages}
+
+    def _revision(self, page: dict, params: dict) -> dict:
+        key = "content" if self._formatversion(params) == 2 else "*"
+        revision = {"revid": page["revid"], "parentid": 0}
+
+        if "content" not in params.get("rvprop", "ids|content"):
+            return revision
+
+        if params.get("rvslots") == "main":
+            revision["slots"] = {
+                "main": {
+                    "contentmodel": "wikitext",
+                    "contentformat": "text/x-wiki",
+                    key: page["content"],
+                }
+            }
+        else:
+            revision[key] = page["content"]
+
+        return revision
+
+    def _page_props(self, page: dict, params: dict) -> dict:
+        result = {"pageid": page["pageid"], "ns": page["ns"], "title": page["title"]}
+        props = params.get("prop", "").split("|")
+
+        if "info" in props:
+            result["lastrevid"] = page["revid"]
+            result["length"] = len(page["content"])
+
+        if "revisions" in props:
+            result["revisions"] = [self._revision(page, params)]
+
+        return result
+
+    def _continued(self, items: list, params: dict, prefix: str):
+        offset = int(params.get(f"{prefix}continue", 0))
+        limit = self.server.data.limit(params.get(f"{prefix}limit"))
+        batch = items[offset : offset + limit]
+
+        if offset + limit < len(items):
+            return batch, {
+                f"{prefix}continue": str(offset + limit),
+                "continue": "-||",
+            }
+
+        return batch, None
+
+    def _with_continue(self, result: dict, continuation: dict | None) -> dict:
+        if continuation is not None:
+            result["continue"] = continuation
+        return result
+
+    def _action_query(self, params: dict) -> dict:
+        if params.get("meta") == "tokens":
+            token_type = params.get("type", "csrf")
+            return {"query": {"tokens": {f"{token_type}token": "+\\"}}}
+
+        if params.get("meta") == "userinfo":
+            return {
+                "query": {
+                    "userinfo": {
+                        "id": 1,
+                        "name": "Bot",
+                        "ratelimits": self.server.data.RATE_LIMITS,
+                    }
+                }
+            }
+
+        if params.get("list") == "categorymembers":
+            return self._list_categorymembers(params)
+
+        if params.get("list") == "allpages":
+            return self._list_allpages(params)
+
+        if params.get("list") == "backlinks":
+            return self._list_backlinks(params)
+
+        if params.get("generator") == "categorymembers":
+            return self._generator_categorymembers(params)
+
+        if params.get("prop") == "linkshere":
+            return self._prop_linkshere(params)
+
+        return self._prop_pages(params)
+
+    def _list_categorymembers(self, params: dict) -> dict:
+        members, continuation = self._continued(
+            self.server.data.sorted_pageids(), params, "cm"
+        )
+        members = [self.server.data.get(pageid) for pageid in members]
+
+        return self._with_continue(
+            {
+                "query": {
+                    "categorymembers": [
+                        {"pageid": page["pageid"], "ns": 0, "title": page["title"]}
+                        for page in members
+                        if page is not None
+                    ]
+                }
+            },
+            continuation,
+        )
+
+    def _generator_categorymembers(self, params: dict) -> dict:
+        members, continuation = self._continued(
+            self.server.data.sorted_pageids(), params, "gcm"
+        )
+        pages = [
+            self._page_props(page, params)
+            for page in map(self.server.data.get, members)
+            if page is not None
+        ]
+
+        return self._with_continue(
+            {"query": {"pages": self._pages_result(pages, params)}}, continuation
+        )
+
+    def _list_allpages(self, params: dict) -> dict:
+        max_size = int(params.get("apmaxsize", 2**31))
+        min_size = int(params.get("apminsize", 0))
+        namespace = int(params.get("apnamespace", 0))
+
+        short_pages = [
+            page
+            for page in map(self.server.data.get, self.server.data.sorted_pageids())
+            if page is not None
+            and page["ns"] == namespace
+            and min_size <= len(page["content"]) <= max_size
+        ]
+        short_pages, continuation = self._continued(short_pages, params, "ap")
+
+        return self._with_continue(
+            {
+                "query": {
+                    "allpages": [
+                        {"pageid": page["pageid"], "ns": 0, "title": page["title"]}
+                        for page in short_pages
+                    ]
+                }
+            },
+            continuation,
+        )
+
+    def _page_from_params(self, params: dict, prefix: str) -> dict | None:
+        if f"{prefix}pageid" in params:
+            return self.server.data.get(int(params[f"{prefix}pageid"]))
+        pageid = self.server.data.titles.get(params.get(f"{prefix}title"))
+        return self.server.data.get(pageid)
+
+    def _backlinks(self, page: dict) -> list[dict]:
+        return [
+            {"pageid": pageid, "ns": 0, "title": f"Page {pageid}"}
+            for pageid in page["backlinks"]
+        ]
+
+    def _list_backlinks(self, params: dict) -> dict:
+        page = self._page_from_params(params, "bl")
+
+        if page is None:
+            return {"error": {"code": "missingtitle", "info": "Page missing."}}
+
+        backlinks, continuation = self._continued(self._backlinks(page), params, "bl")
+
+        return self._with_continue({"query": {"backlinks": backlinks}}, continuation)
+
+    def _requested_pages(self, params: dict) -> list[dict]:
+        if "pageids" in params:
+            requested = [
+                (int(pageid), pageid) for pageid in params["pageids"].split("|")
+            ]
+        else:
+            requested = [
+                (self.server.data.titles.get(title), title)
+                for title in params.get("titles", "").split("|")
+            ]
+
+        return [
+            self.server.data.get(pageid)
+            or {"pageid": pageid, "title": name, "missing": True}
+            for pageid, name in requested
+        ]
+
+    def _prop_linkshere(self, params: dict) -> dict:
+        links = [
+            (page, link)
+            for page in self._requested_pages(params)
+            if "missing" not in page
+            for link in self._backlinks(page)
+        ]
+        links, continuation = self._continued(links, params, "lh")
+
+        pages = {}
+
+        for page in self._requested_pages(params):
+            pages[page["title"]] = {
+                key: page[key] for key in ("pageid", "ns", "title") if key in page
+            }
+
+        for page, link in links:
+            pages[page["title"]].setdefault("linkshere", []).append(link)
+
+        return self._with_continue(
+            {"query": {"pages": self._pages_result(list(pages.values()), params)}},
+            continuation,
+        )
+
+    def _prop_pages(self, params: dict) -> dict:
+        pages = [
+            page if "missing" in page else self._page_props(page, params)
+            for page in self._requested_pages(params)
+        ]
+
+        return {"query": {"pages": self._pages_result(pages, params)}}
+
+    def _action_login(self, params: dict) -> dict:
+        return {"login": {"result": "Success", "lgusername": params.get("lgname")}}
+
+    def _action_edit(self, params: dict) -> dict:
+        page = self.server.data.edit(int(params["pageid"]), params.get("text", ""))
+
+        if page is None:
+            return {"error": {"code": "missingtitle", "info": "Page missing."}}
+
+        return {
+            "edit": {
+                "result": "Success",
+                "pageid": page["pageid"],
+                "title": page["title"],
+                "newrevid": page["revid"],
+            }
+        }
+
+    def _action_delete(self, params: dict) -> dict:
+        if "pageid" in params:
+            pageid = int(params["pageid"])
+        else:
+            pageid = self.server.data.titles.get(params.get("title"))
+
+        page = self.server.data.delete(pageid)
+
+        if page is None:
+            return {"error": {"code": "missingtitle", "info": "Page missing."}}
+
+        return {"delete": {"title": page["title"], "reason": params.get("reason")}}
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        data: WikiData | None = None,
+        latency: float = 0,
+        maxlag_rate: float = 0,
+        ratelimit_rate: float = 0,
+        retry_after: int = 1,
+        compress: bool = True,
+        seed: int = 0,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+    ):
+        super().__init__(address, WikiHandler)
+        self.data = data or WikiData()
+        self.latency = latency
+        self.maxlag_rate = maxlag_rate
+        self.ratelimit_rate = ratelimit_rate
+        self.retry_after = retry_after
+        self.compress = compress
+        self.random = random.Random(seed)
+        self.random_lock = Lock()
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api.php"
+
+    def injected_error(self) -> dict | None:
+        with self.random_lock:
+            draw = self.random.random()
+
+        if draw < self.maxlag_rate:
+            return {
+                "code": "maxlag",
+                "info": "Waiting for a database server.",
+                "lag": 1,
+            }
+
+        if draw < self.maxlag_rate + self.ratelimit_rate:
+            return {"code": "ratelimited", "info": "You've exceeded your rate limit."}
+
+    def start(self):
+        self.thread = Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+if __name__ == "__main__":
+    with StandInServer(address=("127.0.0.1", 8080)) as server:
+        print(f"Serving a MediaWiki stand-in on {server.url}")
+        server.thread.join()
@@ -6,6 +6,8 @@ SETTINGS_PATH = os.path.join("UI", "settings.json")
 
 #api
 BOT_LOGIN_PATH = os.path.join("api", "bot_login.json")
+REVISION_CACHE_PATH = os.path.join("api", "revision_cache_{lang}.sqlite")
+EDIT_JOURNAL_PATH = os.path.join("api", "edit_journal.txt")
 
 #data
 MOB_PROTO_PATH = os.path.join("data", "mob_proto.txt")
@@ -16,4 +18,6 @@ RESULT_WEAPON_PATH = os.path.join("data", "result", "weapon_data.txt")
 RESULT_MONSTER_PATH = os.path.join("data", "result", "monster_data.txt")
 ITEM_NAMES_PATH = os.path.join("data", "{lang}", "item_names.txt")
 MOB_NAMES_PATH = os.path.join("data", "{lang}", "mob_names.txt")
-LANG_ENCODING_PATH = os.path.join("data", "lang_encoding.json")
\ No newline at end of file
+REGISTRY_PATH = os.path.join("data", "{lang}", "registry.csv")
+LANG_ENCODING_PATH = os.path.join("data", "lang_encoding.json")
+PROTO_CACHE_PATH = os.path.join("data", "cache")
\ No newline at end of file
@@ -0,0 +1,66 @@
+import glob
+import hashlib
+import os
+
+import polars as pl
+
+from config.config import PROTO_CACHE_PATH
+
+
+class ArrowCache:
+    EXTENSION = ".arrow"
+
+    def __init__(self, directory: str = PROTO_CACHE_PATH):
+        self.directory = directory
+
+    def _stem(self, path: str) -> str:
+        # The prefix also hashes the absolute path, so the basename is enough.
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def _key(self, *values) -> str:
+        return hashlib.sha1(repr(values).encode()).hexdigest()[:16]
+
+    def _prefix(self, path: str, params: tuple) -> str:
+        return f"{self._stem(path)}-{self._key(os.path.abspath(path), params)}"
+
+    def cache_path(self, path: str, *params) -> str:
+        stat = os.stat(path)
+        source_key = self._key(stat.st_mtime_ns, stat.st_size)
+
+        return os.path.join(
+            self.directory,
+            f"{self._prefix(path, params)}-{source_key}{self.EXTENSION}",
+        )
+
+    def _remove_outdated(self, path: str, params: tuple, cache_path: str):
+        pattern = os.path.join(
+            glob.escape(self.directory),
+            f"{glob.escape(self._prefix(path, params))}-*{self.EXTENSION}",
+        )
+
+        for outdated_path in glob.glob(pattern):
+            if outdated_path != cache_path:
+                try:
+                    os.remove(outdated_path)
+                except OSError:
+                    # Still memory-mapped on Windows, retried on the next change.
+                    pass
+
+    def get(self, path: str, reader, *params) -> str:
+        cache_path = self.cache_path(path, *params)
+
+        if not os.path.exists(cache_path):
+            os.makedirs(self.directory, exist_ok=True)
+            self._remove_outdated(path, params, cache_path)
+
+            temporary_path = f"{cache_path}.tmp"
+            reader().write_ipc(temporary_path)
+            os.replace(temporary_path, cache_path)
+
+        return cache_path
+
+    def read(self, path: str, reader, *params) -> pl.DataFrame:
+        return pl.read_ipc(self.get(path, reader, *params), memory_map=True)
+
+    def scan(self, path: str, reader, *params) -> pl.LazyFrame:
+        return pl.scan_ipc(self.get(path, reader, *params), memory_map=True)
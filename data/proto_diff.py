@@ -0,0 +1,116 @@
+import polars as pl
+
+
+class ProtoDiff:
+    KEY = "Vnum"
+    STATUS = "Status"
+    COLUMN = "Column"
+    OLD = "Old"
+    NEW = "New"
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+
+    def __init__(
+        self,
+        old: pl.LazyFrame | pl.DataFrame,
+        new: pl.LazyFrame | pl.DataFrame,
+        key: str = KEY,
+        columns: list[str] | None = None,
+        old_rename: dict[str, str] | None = None,
+    ):
+        self.key = key
+        self.old = old.lazy()
+        self.new = new.lazy()
+
+        if old_rename is not None:
+            self.old = self.old.rename(old_rename)
+
+        self.new = self.new.with_columns(pl.col(key).cast(self.old.schema[key]))
+
+        self.columns = columns or self._common_columns()
+        self.dtypes = self._comparison_dtypes()
+
+    def _common_columns(self) -> list[str]:
+        new_columns = set(self.new.columns)
+
+        return [
+            column
+            for column in self.old.columns
+            if column in new_columns and column != self.key
+        ]
+
+    def _comparison_dtypes(self) -> dict[str, pl.PolarsDataType]:
+        old_schema = self.old.schema
+        new_schema = self.new.schema
+        dtypes = {}
+
+        for column in self.columns:
+            old_dtype, new_dtype = old_schema[column], new_schema[column]
+
+            if (
+                old_dtype != new_dtype
+                and old_dtype.is_numeric()
+                and new_dtype.is_numeric()
+            ):
+                dtypes[column] = pl.Float64
+            else:
+                dtypes[column] = old_dtype if old_dtype == new_dtype else pl.String
+
+        return dtypes
+
+    def _long(self, data: pl.LazyFrame, value_name: str) -> pl.LazyFrame:
+        return data.select(
+            self.key,
+            *(
+                pl.col(column).cast(dtype).cast(pl.String)
+                for column, dtype in self.dtypes.items()
+            ),
+        ).melt(id_vars=self.key, variable_name=self.COLUMN, value_name=value_name)
+
+    def _keys_only(self, data: pl.LazyFrame, other: pl.LazyFrame, status: str):
+        return (
+            data.select(self.key)
+            .join(other.select(self.key), on=self.key, how="anti")
+            .with_columns(
+                pl.lit(status).alias(self.STATUS),
+                pl.lit(None, dtype=pl.String).alias(self.COLUMN),
+                pl.lit(None, dtype=pl.String).alias(self.OLD),
+                pl.lit(None, dtype=pl.String).alias(self.NEW),
+            )
+        )
+
+    def _changed(self) -> pl.LazyFrame:
+        return (
+            self._long(self.old, self.OLD)
+            .join(self._long(self.new, self.NEW), on=[self.key, self.COLUMN])
+            .filter(pl.col(self.OLD).ne_missing(pl.col(self.NEW)))
+            .select(
+                self.key,
+                pl.lit(self.CHANGED).alias(self.STATUS),
+                self.COLUMN,
+                self.OLD,
+                self.NEW,
+            )
+        )
+
+    def lazy(self) -> pl.LazyFrame:
+        return pl.concat(
+            [
+                self._keys_only(self.new, self.old, self.ADDED),
+                self._keys_only(self.old, self.new, self.REMOVED),
+                self._changed(),
+            ]
+        ).sort(self.key, self.COLUMN, nulls_last=False)
+
+    def collect(self) -> pl.DataFrame:
+        return self.lazy().collect()
+
+    def changed_vnums(self, statuses: tuple[str, ...] = (ADDED, CHANGED)) -> pl.Series:
+        return (
+            self.lazy()
+            .filter(pl.col(self.STATUS).is_in(statuses))
+            .select(pl.col(self.key).unique(maintain_order=True))
+            .collect()
+            .to_series()
+        )
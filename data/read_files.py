@@ -1,9 +1,11 @@
-import pandas as pd
 from typing import Literal
+from functools import cached_property
 import json
 import polars as pl
 
 from config.config import *
+from data.cache import ArrowCache
+from data.proto_diff import ProtoDiff
 from data.proto_info import (
     MOB_TYPE,
     RANK_MAPPING,
@@ -19,9 +21,10 @@ class GameNames:
     SEPARATOR = "\t"
     SCHEMA = {VNUM: pl.Int64, LOCAL_NAME: pl.String}
 
-    def __init__(self, lang: str = "fr"):
+    def __init__(self, lang: str = "fr", cache: ArrowCache | None = None):
         self.lang = lang
         self.encoding = self._get_encoding()
+        self.cache = cache or ArrowCache()
         self.mob = self._read_csv(MOB_NAMES_PATH)
         self.item = self._read_csv(ITEM_NAMES_PATH)
 
@@ -29,10 +32,17 @@ class GameNames:
         with open(LANG_ENCODING_PATH, "r") as file:
             return json.load(file)[self.lang]
 
-    def _read_csv(self, path: str):
+    def _read_csv(self, path: str) -> pl.DataFrame:
+        path = path.format(lang=self.lang)
+
+        return self.cache.read(
+            path, lambda: self._parse_csv(path), self.SCHEMA, self.encoding
+        )
+
+    def _parse_csv(self, path: str) -> pl.DataFrame:
         names = (
             pl.read_csv(
-                source=path.format(lang=self.lang),
+                source=path,
                 has_header=True,
                 separator=self.SEPARATOR,
                 schema=self.SCHEMA,
@@ -55,11 +65,56 @@ class GameProto:
     SEPARATOR = "\t"
     ENCODING = "ISO-8859-1"
 
-    def __init__(self):
-        self.mob = self._read_csv(MOB_PROTO_PATH, MOB_TYPE)
-        # self.item = self._read_csv(ITEM_PROTO_PATH)
+    def __init__(
+        self,
+        cache: ArrowCache | None = None,
+        mob_path: str = MOB_PROTO_PATH,
+        item_path: str = ITEM_PROTO_PATH,
+    ):
+        self.cache = cache or ArrowCache()
+        self.mob_path = mob_path
+        self.item_path = item_path
+
+    @cached_property
+    def mob(self) -> pl.DataFrame:
+        return self.scan_mob().collect()
+
+    @cached_property
+    def item(self) -> pl.DataFrame:
+        return self.scan_item().collect()
+
+    def scan_mob(self, columns: list[str] | None = None, vnums=None) -> pl.LazyFrame:
+        data = self.cache.scan(
+            self.mob_path,
+            lambda: self._parse_csv(self.mob_path, MOB_TYPE),
+            MOB_TYPE,
+        )
+
+        return self._select(data, columns, vnums)
+
+    def scan_item(self, columns: list[str] | None = None, vnums=None) -> pl.LazyFrame:
+        data = self.cache.scan(
+            self.item_path, lambda: self._parse_item_csv(self.item_path)
+        )
+
+        return self._select(data, columns, vnums)
 
-    def _read_csv(self, path: str, dtypes: dict) -> pl.DataFrame:
+    def diff_mob(self, previous: "GameProto", columns: list[str] | None = None):
+        return ProtoDiff(previous.scan_mob(), self.scan_mob(), columns=columns)
+
+    def diff_item(self, previous: "GameProto", columns: list[str] | None = None):
+        return ProtoDiff(previous.scan_item(), self.scan_item(), columns=columns)
+
+    def _select(self, data: pl.LazyFrame, columns: list[str] | None, vnums):
+        if vnums is not None:
+            data = data.filter(pl.col(self.VNUM).is_in(list(vnums)))
+
+        if columns is not None:
+            data = data.select(columns)
+
+        return data
+
+    def _parse_csv(self, path: str, dtypes: dict) -> pl.DataFrame:
         return pl.read_csv(
             source=path,
             has_header=True,
@@ -68,28 +123,42 @@ class GameProto:
             dtypes=dtypes,
         )
 
-    def save_mob_data_for_calculator(self, vnums: tuple):
+    def _parse_item_csv(self, path: str) -> pl.DataFrame:
+        return (
+            pl.read_csv(
+                source=path,
+                has_header=True,
+                separator=self.SEPARATOR,
+                encoding=self.ENCODING,
+                infer_schema_length=None,
+                dtypes={self.VNUM: pl.String},
+            )
+            .with_columns(pl.col(self.VNUM).str.to_integer(strict=False))
+            .drop_nulls(self.VNUM)
+        )
+
+    def save_mob_data_for_calculator(
+        self, vnums: tuple, path: str = RESULT_MONSTER_PATH
+    ):
         data = (
-            (
-                self.mob[USECOLS_CALCULATOR]
-                .filter(pl.col(self.VNUM).is_in(vnums))
-                .with_columns(
-                    pl.col("Rank").replace(RANK_MAPPING, return_dtype=pl.Int8),
-                    pl.col("Type").replace(TYPE_MAPPING, return_dtype=pl.Int8),
-                    pl.col("RaceFlags").replace(
-                        RACE_MAPPING, default=-1, return_dtype=pl.Int8
-                    ),
-                )
+            self.scan_mob(USECOLS_CALCULATOR, vnums)
+            .with_columns(
+                pl.col("Rank").replace(RANK_MAPPING, return_dtype=pl.Int8),
+                pl.col("Type").replace(TYPE_MAPPING, return_dtype=pl.Int8),
+                pl.col("RaceFlags").replace(
+                    RACE_MAPPING, default=-1, return_dtype=pl.Int8
+                ),
             )
+            .collect()
         )
 
         print(data)
 
         monster_data_wiki = {
-            monster_data[-1]: monster_data[:-1] for monster_data in data
+            monster_data[-1]: monster_data[:-1] for monster_data in data.iter_rows()
         }
 
-        with open(RESULT_MONSTER_PATH, "w") as file:
+        with open(path, "w") as file:
             print(monster_data_wiki, file=file)
 
 
@@ -142,121 +211,133 @@ class MobProto:
         },
     }
 
+    MOB_TYPES = ("MONSTER",)
+    ENTITY_TYPES = ("MONSTER", "STONE")
     NO_VALUE = "Aucun"
     TRUE_VALUE = "O"
     FALSE_VALUE = "N"
+    VNUM = "Vnum"
+    OLD_VNUM = "VNUM"
+    SEPARATOR = "\t"
+    ENCODING = "ISO-8859-1"
 
-    def __init__(self):
-        self.data = self._read_csv()
-
-    def _read_csv(self):
-        data = pl.read_csv(
-            MOB_PROTO_PATH,
-            index_col="Vnum",
-            encoding="ISO-8859-1",
-            sep="\t",
-        )
+    def __init__(self, cache: ArrowCache | None = None, path: str = MOB_PROTO_PATH):
+        self.cache = cache or ArrowCache()
+        self.data = self._read_csv(path)
 
-        return data
+    def _read_csv(self, path: str) -> pl.LazyFrame:
+        return self.cache.scan(path, lambda: self._parse_csv(path), self.ENCODING)
 
-    def _get_old_data(self):
-        old_data = pd.read_csv(
-            MOB_PROTO_OLD_PATH,
-            index_col="VNUM",
-            encoding="ISO-8859-1",
-            sep="\t",
+    def _parse_csv(self, path: str) -> pl.DataFrame:
+        return pl.read_csv(
+            source=path,
+            has_header=True,
+            separator=self.SEPARATOR,
+            encoding=self.ENCODING,
+            infer_schema_length=None,
         )
 
-        return old_data
-
-    def _filter_rows(self, data: pd.DataFrame):
-        data = data[data["Type"] == "MONSTER"]
-        data = data.drop("Type", axis=1)
-
-        return data
+    def _get_old_data(self) -> pl.LazyFrame:
+        return self._read_csv(MOB_PROTO_OLD_PATH)
 
-    def _replace_values(self, data: pd.DataFrame):
-        data["Rank"].replace(self.MAPPING["rank"], inplace=True)
-        data["BattleType"].replace(self.MAPPING["battle"], inplace=True)
-        data["RaceFlags"].replace(self.MAPPING["race"], inplace=True)
-        data["RaceFlags"].fillna(self.NO_VALUE, inplace=True)
+    def _filter_rows(self, data: pl.LazyFrame, types: tuple[str, ...]) -> pl.LazyFrame:
+        return data.filter(pl.col("Type").is_in(types)).drop("Type")
 
-        return data
+    def _replace_values(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        return data.with_columns(
+            pl.col("Rank").replace(self.MAPPING["rank"]),
+            pl.col("BattleType").replace(self.MAPPING["battle"]),
+            pl.col("RaceFlags").replace(self.MAPPING["race"]).fill_null(self.NO_VALUE),
+        )
 
-    def _element_processing(self, data: pd.DataFrame):
+    def _element_processing(self, data: pl.LazyFrame) -> pl.LazyFrame:
         element_mapping: dict = self.MAPPING["element"]
-        element_names = element_mapping.values()
-
-        def process(row: pd.Series):
-            row = row[element_names]
-            elements = "|".join(row[row != 0].index.to_list())
-            return elements if elements else self.NO_VALUE
 
-        data.rename(columns=element_mapping, inplace=True)
-        data["Element"] = data.apply(process, axis=1)
-        data = data.drop(element_names, axis=1)
-
-        return data
-
-    def _handle_exp(self, data: pd.DataFrame):
-        data["Exp"] = data.apply(lambda row: max(row["Exp"], row["SungMaExp"]), axis=1)
-        data = data.drop("SungMaExp", axis=1)
-
-        return data
-
-    def _handle_flags(self, data: pd.DataFrame):
-        data["AiFlags0"].fillna("", inplace=True)
-        data["AGGR"] = (
-            data["AiFlags0"]
-            .str.contains("AGGR")
-            .apply(lambda x: self.TRUE_VALUE if x else self.FALSE_VALUE)
+        elements = pl.concat_str(
+            [
+                pl.when(pl.col(column) != 0).then(pl.lit(element_name))
+                for column, element_name in element_mapping.items()
+            ],
+            separator="|",
+            ignore_nulls=True,
         )
 
-        data = data.drop("AiFlags0", axis=1)
-
-        return data
-
-    def _handle_effects(self, data: pd.DataFrame):
-        for column in ["EnchantSlow", "EnchantStun", "EnchantPoison"]:
-            data[column] = data[column].apply(
-                lambda x: self.TRUE_VALUE if x else self.FALSE_VALUE
-            )
-
-        return data
-
-    def _change_columns_type(self, data: pd.DataFrame):
-        for column in data.columns:
-            data[column] = data[column].astype(str)
+        return data.with_columns(
+            pl.when(elements == "")
+            .then(pl.lit(self.NO_VALUE))
+            .otherwise(elements)
+            .alias("Element")
+        ).drop(element_mapping.keys())
+
+    def _handle_exp(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        return data.with_columns(
+            pl.max_horizontal("Exp", "SungMaExp").alias("Exp")
+        ).drop("SungMaExp")
+
+    def _boolean_value(self, condition: pl.Expr) -> pl.Expr:
+        return (
+            pl.when(condition)
+            .then(pl.lit(self.TRUE_VALUE))
+            .otherwise(pl.lit(self.FALSE_VALUE))
+        )
 
-        return data
+    def _handle_flags(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        return data.with_columns(
+            self._boolean_value(
+                pl.col("AiFlags0").fill_null("").str.contains("AGGR")
+            ).alias("AGGR")
+        ).drop("AiFlags0")
+
+    def _handle_effects(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        return data.with_columns(
+            self._boolean_value(pl.col(column).fill_null(0) != 0).alias(column)
+            for column in ["EnchantSlow", "EnchantStun", "EnchantPoison"]
+        )
 
-    def _rename_columns(self, data: pd.DataFrame):
-        return data.rename(columns=self.MAPPING["columns"])
+    def _change_columns_type(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        return data.with_columns(pl.all().cast(pl.String))
+
+    def _rename_columns(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        return data.rename(self.MAPPING["columns"])
+
+    def _data_processing(
+        self, data: pl.LazyFrame, types: tuple[str, ...] = MOB_TYPES
+    ) -> pl.LazyFrame:
+        return (
+            data.pipe(self._filter_rows, types)
+            .pipe(self._replace_values)
+            .pipe(self._element_processing)
+            .pipe(self._handle_exp)
+            .pipe(self._handle_flags)
+            .pipe(self._handle_effects)
+            .pipe(self._change_columns_type)
+            .pipe(self._rename_columns)
+        )
 
-    def _data_processing(self, data: pd.DataFrame):
-        data = self._filter_rows(data)
-        data = self._replace_values(data)
-        data = self._element_processing(data)
-        data = self._handle_exp(data)
-        data = self._handle_flags(data)
-        data = self._handle_effects(data)
-        data = self._change_columns_type(data)
-        data = self._rename_columns(data)
+    def wiki_data(self, vnums=None, types: tuple[str, ...] = MOB_TYPES) -> pl.DataFrame:
+        data = self.data
 
-        return data
+        if vnums is not None:
+            data = data.filter(pl.col(self.VNUM).is_in(list(vnums)))
 
-    def dam_multiply_correction(self, data: pd.DataFrame):
-        true_dam_multiply = self._get_old_data()["DAM_MULTIPLY"]
+        return self._data_processing(data, types).collect()
 
-        for vnum in true_dam_multiply.index:
-            if vnum in data.index:
-                dam_multiply_new = data.loc[vnum, "DamMultiply"]
-                dam_multiply_old = true_dam_multiply.loc[vnum]
+    def dam_multiply_correction(self, data: pl.DataFrame) -> pl.DataFrame:
+        differences = ProtoDiff(
+            old=self._get_old_data(),
+            new=data,
+            columns=["DamMultiply"],
+            old_rename={self.OLD_VNUM: self.VNUM, "DAM_MULTIPLY": "DamMultiply"},
+        ).lazy()
 
-                if dam_multiply_old != dam_multiply_new:
-                    print(vnum, dam_multiply_new, dam_multiply_old)
+        differences = differences.filter(
+            pl.col(ProtoDiff.STATUS) == ProtoDiff.CHANGED
+        ).collect()
 
-        # data.loc[data.index.isin(true_dam_multiply.index), 'DamMultiply'] = true_dam_multiply
+        for vnum, dam_multiply_new, dam_multiply_old in differences.select(
+            ProtoDiff.KEY, ProtoDiff.NEW, ProtoDiff.OLD
+        ).iter_rows():
+            print(vnum, dam_multiply_new, dam_multiply_old)
 
         return data
 
@@ -323,17 +404,27 @@ class MobProto:
             "OUTPOST": -1,
         }
 
-        data: pd.DataFrame = self.data.loc[vnums, usecols]
-        data["Rank"].replace(rank_mapping, inplace=True)
-        data["Type"].replace(type_mapping, inplace=True)
-        data["RaceFlags"].replace(race_mapping, inplace=True)
-        data["RaceFlags"].fillna(-1, inplace=True)
-        data["RaceFlags"] = data["RaceFlags"].astype(int)
-        data["NameFR"] = titles
+        data = (
+            pl.LazyFrame({self.VNUM: list(vnums), "NameFR": list(titles)})
+            .join(self.data, on=self.VNUM, how="left")
+            .select(self.VNUM, *usecols)
+            .with_columns(
+                pl.col("Rank").replace(
+                    rank_mapping, default=None, return_dtype=pl.Int64
+                ),
+                pl.col("Type").replace(
+                    type_mapping, default=None, return_dtype=pl.Int64
+                ),
+                pl.col("RaceFlags").replace(
+                    race_mapping, default=-1, return_dtype=pl.Int64
+                ),
+            )
+            .collect()
+        )
 
         data = self.dam_multiply_correction(data)
 
-        data = data.to_numpy().tolist()
+        data = data.drop(self.VNUM).rows()
 
         monster_data_wiki = {
             monster_data[-1]: monster_data[:-1] for monster_data in data
@@ -10,15 +10,13 @@ from UI.graphic import WikiApp
 
 #     metin2wiki.login()
 
-#     monster_pages = metin2wiki.category("Monstres (temporaire)")
-#     monster_pages = metin2wiki.pages(monster_pages)
-#     monster_pages = [MonsterPage(page) for page in monster_pages.content(parse=True)]
+#     monster_pages = metin2wiki.category_content("Monstres (temporaire)", parse=True)
+#     monster_pages = (MonsterPage(page) for page in monster_pages)
 
-#     metin_pages = metin2wiki.category("Pierres Metin")
-#     metin_pages = metin2wiki.pages(metin_pages)
-#     metin_pages = [MetinPage(page) for page in metin_pages.content(parse=True)]
+#     metin_pages = metin2wiki.category_content("Pierres Metin", parse=True)
+#     metin_pages = (MetinPage(page) for page in metin_pages)
 
-#     monster_pages += metin_pages
+#     monster_pages = [*monster_pages, *metin_pages]
 
 #     monster_pages.sort(key=lambda x: x.vnum)
 
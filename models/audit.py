@@ -0,0 +1,143 @@
+import polars as pl
+
+from data.proto_diff import ProtoDiff
+from data.read_files import MobProto
+from models.page import MetinPage, MonsterPage
+from models.sync import ProtoSync
+
+
+class ProtoAudit:
+    CATEGORIES = {
+        MonsterPage: "Monstres",
+        MetinPage: "Pierres Metin",
+    }
+    PAGEID = "Pageid"
+    VNUM = MobProto.VNUM
+    TITLE = "Title"
+    WIKI = "Wiki"
+    PROTO = "Proto"
+    ELEMENT = ProtoSync.ELEMENT
+    SECOND_ELEMENT = ProtoSync.SECOND_ELEMENT
+    AGGRESSIVE = "Agressif"
+    SP_DRAIN = "PM"
+
+    def __init__(
+        self,
+        metin2wiki,
+        mob_proto: MobProto | None = None,
+        workers: int | None = None,
+    ):
+        self.metin2wiki = metin2wiki
+        self.mob_proto = mob_proto or MobProto()
+        self.workers = workers
+        self.columns = [*ProtoSync.SYNC_PARAMETERS, self.ELEMENT]
+
+    def _entities(self):
+        for page_class, category in self.CATEGORIES.items():
+            pages = self.metin2wiki.category_content(category)
+            yield from page_class.from_pages(pages, workers=self.workers)
+
+    def wiki_data(self, entities: list | None = None) -> pl.DataFrame:
+        if entities is None:
+            entities = list(self._entities())
+
+        rows = [
+            {
+                self.PAGEID: entity.pageid,
+                self.VNUM: entity.vnum,
+                self.TITLE: entity.title,
+                self.SECOND_ELEMENT: entity.parameters.get(self.SECOND_ELEMENT),
+                **{column: entity.parameters.get(column) for column in self.columns},
+            }
+            for entity in entities
+        ]
+
+        schema = {
+            self.PAGEID: pl.Int64,
+            self.VNUM: pl.Int64,
+            self.TITLE: pl.String,
+            self.SECOND_ELEMENT: pl.String,
+            **{column: pl.String for column in self.columns},
+        }
+
+        return (
+            pl.DataFrame(rows, schema=schema)
+            .with_columns(pl.col(pl.String).replace("", None))
+            .with_columns(
+                pl.col(self.AGGRESSIVE).str.replace("^NO$", MobProto.FALSE_VALUE),
+                pl.col(self.SP_DRAIN).fill_null("0"),
+                pl.concat_str(
+                    [pl.col(self.ELEMENT), pl.col(self.SECOND_ELEMENT)],
+                    separator="|",
+                    ignore_nulls=True,
+                )
+                .replace("", None)
+                .fill_null(MobProto.NO_VALUE)
+                .alias(self.ELEMENT),
+            )
+            .drop(self.SECOND_ELEMENT)
+        )
+
+    def audited_cells(self, entities: list) -> pl.LazyFrame:
+        cells = [
+            (entity.pageid, column)
+            for entity in entities
+            for column in self.columns
+            if column in entity.parameters or column == self.SP_DRAIN
+        ]
+
+        return pl.LazyFrame(
+            cells,
+            schema={self.PAGEID: pl.Int64, ProtoDiff.COLUMN: pl.String},
+            orient="row",
+        )
+
+    def proto_data(self, vnums) -> pl.DataFrame:
+        return (
+            self.mob_proto.wiki_data(vnums, types=MobProto.ENTITY_TYPES)
+            .select(self.VNUM, *self.columns)
+            .with_columns(pl.col(self.VNUM).cast(pl.Int64))
+        )
+
+    def run(self) -> pl.DataFrame:
+        entities = list(self._entities())
+        wiki_data = self.wiki_data(entities)
+        proto_data = self.proto_data(wiki_data[self.VNUM])
+
+        # Compared page by page, as several pages can share a vnum.
+        differences = ProtoDiff(
+            old=wiki_data.drop(self.VNUM, self.TITLE),
+            new=wiki_data.select(self.PAGEID, self.VNUM)
+            .join(proto_data, on=self.VNUM)
+            .drop(self.VNUM),
+            key=self.PAGEID,
+            columns=self.columns,
+        ).lazy()
+
+        # Only compare parameters the page template actually has.
+        mismatches = pl.concat(
+            [
+                differences.filter(pl.col(ProtoDiff.STATUS) == ProtoDiff.REMOVED),
+                differences.filter(pl.col(ProtoDiff.STATUS) == ProtoDiff.CHANGED).join(
+                    self.audited_cells(entities),
+                    on=[self.PAGEID, ProtoDiff.COLUMN],
+                    how="semi",
+                ),
+            ]
+        ).rename({ProtoDiff.OLD: self.WIKI, ProtoDiff.NEW: self.PROTO})
+
+        return (
+            mismatches.join(
+                wiki_data.lazy().select(self.PAGEID, self.VNUM, self.TITLE),
+                on=self.PAGEID,
+            )
+            .select(
+                self.VNUM,
+                self.TITLE,
+                ProtoDiff.STATUS,
+                ProtoDiff.COLUMN,
+                self.WIKI,
+                self.PROTO,
+            )
+            .collect()
+        )
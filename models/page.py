@@ -1,6 +1,120 @@
-from typing import Any, Literal
+from typing import Any, Literal, NamedTuple
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 import mwparserfromhell
 
+from utils.utils import bounded_map, text_hash
+
+TEMPLATE_TOKEN = re.compile(r"\{\{|\}\}|\[\[|\]\]|\||=")
+UNSUPPORTED_MARKUP = re.compile(
+    r"<!--|\{\{\{|<(nowiki|pre|ref|math|gallery|includeonly|noinclude|onlyinclude"
+    r"|source|syntaxhighlight)\b",
+    re.IGNORECASE,
+)
+REVISION_PARAMS = {"prop": "revisions", "rvprop": "ids|content", "rvslots": "main"}
+
+
+class EntityData(NamedTuple):
+    pageid: int
+    title: str
+    vnum: int
+    parameters: dict[str, str]
+
+
+def revision_content(revision: dict) -> str:
+    return revision["slots"]["main"]["content"]
+
+
+def _scan_first_template(text: str) -> tuple[str, dict[str, str]] | None:
+    start = text.find("{{")
+
+    if start < 0:
+        return None
+
+    parts = []
+    part_start = start + 2
+    equal_sign = None
+    template_depth = link_depth = 0
+
+    for token in TEMPLATE_TOKEN.finditer(text, start + 2):
+        value, position = token.group(), token.start()
+
+        if value == "{{":
+            template_depth += 1
+        elif value == "}}" and template_depth:
+            template_depth -= 1
+        elif value == "[[":
+            link_depth += 1
+        elif value == "]]" and link_depth:
+            link_depth -= 1
+        elif template_depth or link_depth:
+            continue
+        elif value == "=":
+            equal_sign = equal_sign or position
+        elif value in ("|", "}}"):
+            parts.append((part_start, equal_sign, position))
+            part_start, equal_sign = position + 1, None
+
+            if value == "}}":
+                break
+    else:
+        raise ValueError("Unbalanced template.")
+
+    if UNSUPPORTED_MARKUP.search(text, 0, position):
+        raise ValueError("Unsupported markup in template.")
+
+    name_start, _, name_end = parts[0]
+    parameters = {}
+    positional_index = 0
+
+    for part_start, equal_sign, part_end in parts[1:]:
+        if equal_sign is None:
+            positional_index += 1
+            parameters[str(positional_index)] = text[part_start:part_end].strip()
+        else:
+            parameter_name = text[part_start:equal_sign].strip()
+            parameters[parameter_name] = text[equal_sign + 1 : part_end].strip()
+
+    return text[name_start:name_end].strip(), parameters
+
+
+def extract_infobox(text: str) -> tuple[str, dict[str, str]] | None:
+    try:
+        return _scan_first_template(text)
+    except ValueError:
+        pass
+
+    templates = mwparserfromhell.parse(text).filter_templates()
+
+    if not templates:
+        return None
+
+    parameters = {
+        str(param.name).strip(): str(param.value).strip()
+        for param in templates[0].params
+    }
+
+    return str(templates[0].name).strip(), parameters
+
+
+def template_name_matches(name: str, template_name: str) -> bool:
+    def normalize(name: str):
+        name = name.strip().replace("_", " ")
+        return name[:1].upper() + name[1:]
+
+    return normalize(name) == normalize(template_name)
+
+
+def _extract_parameters(page_data: tuple[int, str, str, str]):
+    pageid, title, text, entity = page_data
+    infobox = extract_infobox(text)
+
+    if infobox is None or not template_name_matches(infobox[0], entity):
+        return pageid, title, None
+
+    return pageid, title, infobox[1]
+
 
 class Page:
     def __init__(
@@ -10,11 +124,14 @@ class Page:
         pageid: int | None = None,
         content=None,
         parse=False,
+        revid: int | None = None,
     ):
         self.mediawiki = mediawiki
         self.title = title
         self.pageid = pageid
-        self.content = self._parse(content, parse)
+        self.revid = revid
+        self._set_content(content, parse)
+        self.fetched_hash = text_hash(self.text)
 
     def __str__(self):
         return f"(Page: [name: {self.title}, content: {self.content}])"
@@ -24,41 +141,59 @@ class Page:
             return self.pageid == __value.pageid
         return False
 
+    @property
+    def content(self):
+        if self._parse_pending:
+            self._content = mwparserfromhell.parse(self._content)
+            self._parse_pending = False
+        return self._content
+
+    @content.setter
+    def content(self, content):
+        self._set_content(content, parse=False)
+
+    @property
+    def text(self) -> str | None:
+        if self._content is not None:
+            return str(self._content)
+
+    def _set_content(self, content, parse):
+        self._content = content
+        self._parse_pending = parse and content is not None
+
     def _parse(self, content, parse):
         if content is not None:
             if parse:
                 return mwparserfromhell.parse(content)
             return content
 
+    @property
+    def key(self) -> int | str:
+        return self.pageid if self.pageid is not None else self.title
+
     @property
     def backlinks(self):
-        query_params = {
-            "action": "query",
-            "format": "json",
-            "list": "backlinks",
-            "bllimit": "max",
-        }
+        return self.mediawiki.backlinks([self])[self.key]
 
-        if self.title is not None:
-            query_params["bltitle"] = self.title
-        else:
-            query_params["blpageid"] = self.pageid
+    def get_content(self, parse=False):
+        if self._content is not None:
+            return
 
-        request_result = self.mediawiki.wiki_request(query_params)
-        pages = request_result["query"]["backlinks"]
+        if self.pageid is not None and self.mediawiki.cache is not None:
+            page = next(self.mediawiki.pages([self.pageid]).iter_content(), None)
 
-        return [Page(self, page["title"], page["pageid"]) for page in pages]
+            if page is None:
+                raise ValueError(f"Page {self.pageid} doesn't exist.")
 
-    def get_content(self, parse=False):
-        if self.content is not None:
+            self.revid = page.revid
+            self._set_content(page.text, parse)
+            self.fetched_hash = page.fetched_hash
             return
 
         query_params = {
             "action": "query",
             "format": "json",
-            "prop": "revisions",
-            "rvprop": "content",
-            "formatversion": "2",
+            **REVISION_PARAMS,
         }
 
         if self.pageid is not None:
@@ -69,9 +204,14 @@ class Page:
             raise ValueError()
 
         request_result = self.mediawiki.wiki_request(query_params)
-        content = request_result["query"]["pages"][0]["revisions"][0]["content"]
+        revision = request_result["query"]["pages"][0]["revisions"][0]
 
-        self.content = self._parse(content, parse)
+        self.revid = revision["revid"]
+        self._set_content(revision_content(revision), parse)
+        self.fetched_hash = text_hash(self.text)
+
+    def is_modified(self) -> bool:
+        return text_hash(self.text) != self.fetched_hash
 
     def write(self, summary=""):
         self.mediawiki.edit(page=self, summary=summary)
@@ -79,6 +219,12 @@ class Page:
     def delete(self, reason=""):
         self.mediawiki.delete(page=self, reason=reason)
 
+    def infobox(self) -> tuple[str, dict[str, str]] | None:
+        if self._content is None:
+            self.get_content()
+
+        return extract_infobox(self.text)
+
     def get_parameters(self, template):
         return [param.name for param in template.params]
 
@@ -116,13 +262,18 @@ class Page:
 
 
 class EntityPage(Page):
+    ENTITY = None
+    CODE = "Code"
+
     def __init__(self, page: Page, entity: Literal["Monstres", "Metin"] = "Monstre"):
         super().__init__(
             mediawiki=page.mediawiki,
             title=page.title,
             pageid=page.pageid,
             content=page.content,
+            revid=page.revid,
         )
+        self.fetched_hash = page.fetched_hash
         self.page = page
         self.entity = entity
         self.template = self._check_template()
@@ -141,8 +292,85 @@ class EntityPage(Page):
         else:
             raise ValueError(f"{self.page.title} doesn't have {self.entity} template.")
 
+    @staticmethod
+    def _valid_code(code: str, max_length: int) -> bool:
+        return code.isascii() and code.isalpha() and len(code) <= max_length
+
+    @staticmethod
+    def _with_content(pages: list[Page]) -> list[Page]:
+        missing = [
+            page.pageid
+            for page in pages
+            if page._content is None and page.pageid is not None
+        ]
+
+        fetched = {}
+
+        if missing:
+            mediawiki = pages[0].mediawiki
+            fetched = {
+                page.pageid: page for page in Pages(mediawiki, missing).iter_content()
+            }
+
+        for page in pages:
+            if page._content is None and page.pageid is None:
+                page.get_content()
+
+        return [fetched.get(page.pageid, page) for page in pages]
+
+    @classmethod
+    def from_pages(
+        cls, pages, workers: int | None = None, entity: str | None = None
+    ) -> list[EntityData]:
+        entity = entity or cls.ENTITY
+
+        if entity is None:
+            raise ValueError("An entity template name is needed.")
+
+        pages = list(pages)
+
+        if not pages:
+            return []
+
+        mediawiki = pages[0].mediawiki
+        pages = cls._with_content(pages)
+
+        for page in pages:
+            if page.text is None:
+                print(f"{page.title} can't be fetched.")
+
+        pages = [page for page in pages if page.text is not None]
+        workers = workers or os.cpu_count()
+        chunksize = max(1, len(pages) // (4 * workers))
+        page_data = ((page.pageid, page.title, page.text, entity) for page in pages)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(_extract_parameters, page_data, chunksize=chunksize)
+            )
+
+        entities = []
+
+        for pageid, title, parameters in results:
+            if parameters is None:
+                print(f"{title} doesn't have {entity} template.")
+            elif cls._valid_code(
+                parameters.get(cls.CODE, ""), mediawiki.MAX_CODE_LENGTH
+            ):
+                entities.append((pageid, title, parameters))
+            else:
+                print(f"{title} doesn't have a valid {cls.CODE}.")
+
+        codes = [parameters[cls.CODE] for _, _, parameters in entities]
+        vnums = mediawiki.codes_to_vnums(codes)
+
+        return [
+            EntityData(pageid, title, int(vnum), parameters)
+            for (pageid, title, parameters), vnum in zip(entities, vnums)
+        ]
+
     def _get_vnum(self):
-        code = self.template.get("Code").value
+        code = self.template.get(self.CODE).value
         code = str(code).strip()
 
         return self.mediawiki.code_to_vnum(str(code))
@@ -205,13 +433,17 @@ class EntityPage(Page):
 
 
 class MonsterPage(EntityPage):
+    ENTITY = "Monstres"
+
     def __init__(self, page: Page):
-        super().__init__(page=page, entity="Monstres")
+        super().__init__(page=page, entity=self.ENTITY)
 
 
 class MetinPage(EntityPage):
+    ENTITY = "Metin"
+
     def __init__(self, page: Page):
-        super().__init__(page=page, entity="Metin")
+        super().__init__(page=page, entity=self.ENTITY)
 
 
 class Pages:
@@ -219,34 +451,91 @@ class Pages:
         self.mediawiki = mediawiki
         self.data = self.mediawiki._check_params(data, type_="ids")
 
-    def content(self, parse=False):
-        def create_page(page_data):
-            page = Page(
-                mediawiki=self.mediawiki,
-                title=page_data["title"],
-                pageid=page_data["pageid"],
-                content=page_data["revisions"][0]["content"],
-                parse=parse,
-            )
+    def _create_page(self, page_data: dict, parse: bool):
+        revision = page_data["revisions"][0]
 
-            return page
+        return Page(
+            mediawiki=self.mediawiki,
+            title=page_data["title"],
+            pageid=page_data["pageid"],
+            content=revision_content(revision),
+            parse=parse,
+            revid=revision["revid"],
+        )
 
-        query_params = {
-            "action": "query",
-            "format": "json",
-            "prop": "revisions",
-            "rvprop": "content",
-            "formatversion": "2",
-        }
+    def _query_pages(self, query_params: dict, pageids: list[int]) -> dict:
+        results = {}
+        pending = pageids
+
+        # Results cut by the size limit are continued, and pageids over the
+        # client's limit are left out of the result, so they are requested
+        # again until no more pages come back.
+        while pending:
+            query_params["pageids"] = "|".join(map(str, pending))
+
+            for request_result in self.mediawiki._continued_requests(query_params):
+                for page_data in request_result.get("query", {}).get("pages", []):
+                    results.setdefault(page_data.get("pageid"), {}).update(page_data)
+
+            unreturned = [pageid for pageid in pending if pageid not in results]
+
+            if len(unreturned) == len(pending):
+                break
+
+            pending = unreturned
+
+        return results
+
+    def _revisions(self, pageids: list[int], parse: bool) -> list[Page]:
+        query_params = {"action": "query", "format": "json", **REVISION_PARAMS}
+        results = self._query_pages(query_params, pageids)
+        pages = []
+
+        for pageid in pageids:
+            page_data = results.get(pageid, {})
+
+            if "revisions" in page_data:
+                pages.append(self._create_page(page_data, parse))
+            elif "missing" not in page_data:
+                print(f"Page {pageid} has no revision.")
+
+        return pages
 
-        result = []
+    def _infos(self, pageids: list[int]) -> list[dict]:
+        query_params = {"action": "query", "format": "json", "prop": "info"}
 
-        for pages in self.data:
-            query_params["pageids"] = "|".join(map(str, pages))
-            request_result = self.mediawiki.wiki_request(query_params)
-            result += request_result["query"]["pages"]
+        return list(self._query_pages(query_params, pageids).values())
 
-        return [create_page(page_data) for page_data in result]
+    def iter_revisions(self, parse=False):
+        results = bounded_map(
+            self.mediawiki.executor,
+            lambda pageids: self._revisions(pageids, parse),
+            self.data,
+            self.mediawiki.max_workers,
+        )
+
+        for pages in results:
+            if self.mediawiki.cache is not None:
+                self.mediawiki.cache.save(pages)
+
+            yield from pages
+
+    def iter_content(self, parse=False):
+        if self.mediawiki.cache is None:
+            yield from self.iter_revisions(parse)
+            return
+
+        pages_info = bounded_map(
+            self.mediawiki.executor,
+            self._infos,
+            self.data,
+            self.mediawiki.max_workers,
+        )
+
+        yield from self.mediawiki.cached_content(pages_info, parse)
+
+    def content(self, parse=False):
+        return list(self.iter_content(parse=parse))
 
 
 if __name__ == "__main__":
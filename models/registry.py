@@ -0,0 +1,145 @@
+import os
+
+import polars as pl
+
+from config import config
+from models.page import Page, Pages
+
+
+class PageRegistry:
+    PAGEID = "pageid"
+    REVID = "revid"
+    VNUM = "vnum"
+    TITLE = "title"
+    CATEGORY = "category"
+    CODE = "Code"
+    CODE_PATTERN = "^[a-zA-Z]+$"
+    SCHEMA = {
+        PAGEID: pl.Int64,
+        REVID: pl.Int64,
+        VNUM: pl.Int64,
+        TITLE: pl.String,
+        CATEGORY: pl.String,
+    }
+
+    def __init__(self, metin2wiki, path: str | None = None):
+        self.metin2wiki = metin2wiki
+        self.path = path or config.REGISTRY_PATH.format(lang=metin2wiki.lang)
+        self.data = self._read()
+        self._index()
+
+    def _read(self) -> pl.DataFrame:
+        if not os.path.exists(self.path):
+            return pl.DataFrame(schema=self.SCHEMA)
+
+        return pl.read_csv(self.path, schema=self.SCHEMA)
+
+    def _index(self):
+        rows = self.data.rows(named=True)
+
+        self.by_pageid = {row[self.PAGEID]: row for row in rows}
+        self.by_vnum = {}
+        self.by_title = {}
+
+        for row in rows:
+            if row[self.VNUM] is not None:
+                self.by_vnum.setdefault(row[self.VNUM], row)
+            self.by_title.setdefault(row[self.TITLE], row)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.data.write_csv(self.path)
+
+    def _page(self, row: dict | None) -> Page | None:
+        if row is not None:
+            return Page(self.metin2wiki, title=row[self.TITLE], pageid=row[self.PAGEID])
+
+    def page_from_vnum(self, vnum: int) -> Page | None:
+        return self._page(self.by_vnum.get(vnum))
+
+    def page_from_title(self, title: str) -> Page | None:
+        return self._page(self.by_title.get(title))
+
+    def vnum_from_pageid(self, pageid: int) -> int | None:
+        row = self.by_pageid.get(pageid)
+
+        if row is not None:
+            return row[self.VNUM]
+
+    def pages_from_vnums(self, vnums) -> list[Page]:
+        pages = (self.page_from_vnum(vnum) for vnum in vnums)
+
+        return [page for page in pages if page is not None]
+
+    def join(self, data: pl.DataFrame, on: str = "Vnum") -> pl.DataFrame:
+        return data.join(self.data, left_on=on, right_on=self.VNUM, how="left")
+
+    def _get_code(self, page: Page) -> str | None:
+        infobox = page.infobox()
+
+        if infobox is not None:
+            return infobox[1].get(self.CODE)
+
+    def _fetch(self, pageids: list[int], category: str) -> pl.DataFrame:
+        rows = [
+            (page.pageid, page.revid, self._get_code(page), page.title)
+            for page in Pages(self.metin2wiki, pageids).iter_content()
+        ]
+
+        data = pl.DataFrame(
+            rows,
+            schema={
+                self.PAGEID: pl.Int64,
+                self.REVID: pl.Int64,
+                self.CODE: pl.String,
+                self.TITLE: pl.String,
+            },
+            orient="row",
+        )
+
+        # Pages without a valid code are kept with a null vnum.
+        vnums = data.filter(
+            pl.col(self.CODE).str.contains(self.CODE_PATTERN)
+            & (pl.col(self.CODE).str.len_bytes() <= self.metin2wiki.MAX_CODE_LENGTH)
+        ).select(
+            self.PAGEID,
+            pl.col(self.CODE)
+            .map_batches(self.metin2wiki.codes_to_vnums, return_dtype=pl.Int64)
+            .alias(self.VNUM),
+        )
+
+        return (
+            data.join(vnums, on=self.PAGEID, how="left")
+            .select(
+                self.PAGEID,
+                self.REVID,
+                self.VNUM,
+                self.TITLE,
+                pl.lit(category).alias(self.CATEGORY),
+            )
+            .cast(self.SCHEMA)
+        )
+
+    def refresh(self, categories: list[str]):
+        for category in categories:
+            members = {
+                page["pageid"]: page
+                for pages_info in self.metin2wiki.category_info(category)
+                for page in pages_info
+            }
+
+            outdated_pageids = [
+                pageid
+                for pageid, page in members.items()
+                if self.by_pageid.get(pageid, {}).get(self.REVID) != page["lastrevid"]
+            ]
+
+            kept = self.data.filter(
+                (pl.col(self.CATEGORY).ne_missing(category))
+                | pl.col(self.PAGEID).is_in(members.keys())
+            ).filter(~pl.col(self.PAGEID).is_in(outdated_pageids))
+
+            self.data = pl.concat([kept, self._fetch(outdated_pageids, category)])
+            self._index()
+
+        self.save()
@@ -0,0 +1,120 @@
+from data.read_files import GameProto, MobProto
+from models.page import EntityPage, MetinPage, MonsterPage, Pages
+from models.registry import PageRegistry
+
+
+class ProtoSync:
+    ELEMENT = "Élément"
+    SECOND_ELEMENT = "Élément2"
+    SYNC_PARAMETERS = [
+        "Niveau",
+        "Rang",
+        "Type",
+        "Exp",
+        "Dégâts",
+        "Agressif",
+        "Poison",
+        "Ralentissement",
+        "Étourdissement",
+        "PM",
+    ]
+    SUMMARY = "Mise à jour depuis le mob_proto"
+    CATEGORIES = ["Monstres", "Pierres Metin"]
+    ENTITY_PAGES = (MonsterPage, MetinPage)
+
+    def __init__(
+        self,
+        metin2wiki,
+        registry: PageRegistry | None = None,
+        mob_proto: MobProto | None = None,
+    ):
+        self.metin2wiki = metin2wiki
+        self.registry = registry or PageRegistry(metin2wiki)
+        self.mob_proto = mob_proto
+
+    def changed_vnums(self, previous: GameProto, current: GameProto) -> list[int]:
+        return current.diff_mob(previous).changed_vnums().to_list()
+
+    def _wiki_values(
+        self, mob_proto: MobProto, vnums: list[int]
+    ) -> dict[int, dict[str, str]]:
+        wiki_data = mob_proto.wiki_data(vnums, types=MobProto.ENTITY_TYPES)
+
+        return {int(row[MobProto.VNUM]): row for row in wiki_data.rows(named=True)}
+
+    def _entity_page(self, page) -> EntityPage | None:
+        for page_class in self.ENTITY_PAGES:
+            try:
+                return page_class(page)
+            except ValueError as err:
+                error = err
+
+        print(error)
+
+    def _set_value(self, page: EntityPage, parameter_name: str, value: str):
+        if not page.template.has(parameter_name):
+            return
+
+        old_value = str(page.template.get(parameter_name).value)
+        stripped_value = old_value.strip()
+
+        if stripped_value == value:
+            return
+
+        leading = old_value[: len(old_value) - len(old_value.lstrip())]
+        trailing = old_value[len(old_value.rstrip()) :]
+        page.change_parameter_value(parameter_name, f"{leading}{value}{trailing}")
+
+    def _add_second_element(self, page: EntityPage, value: str):
+        names = [str(parameter.name).strip() for parameter in page.template.params]
+        index = names.index(self.ELEMENT) + 1
+        before = page.template.params[index].name if index < len(names) else None
+
+        page.add_parameter(self.SECOND_ELEMENT, value, before=before)
+
+    def _set_second_element(self, page: EntityPage, elements: list[str]):
+        if len(elements) < 2:
+            page.delete_parameter(self.SECOND_ELEMENT)
+        elif page.template.has(self.SECOND_ELEMENT):
+            self._set_value(page, self.SECOND_ELEMENT, elements[1])
+        elif page.template.has(self.ELEMENT):
+            self._add_second_element(page, elements[1])
+
+    def _update_page(self, page: EntityPage, values: dict[str, str]):
+        for parameter_name in self.SYNC_PARAMETERS:
+            self._set_value(page, parameter_name, values[parameter_name])
+
+        elements = values[self.ELEMENT].split("|")
+        self._set_value(page, self.ELEMENT, elements[0])
+        self._set_second_element(page, elements)
+
+    def _updated_pages(self, mob_proto: MobProto, vnums: list[int]):
+        wiki_values = self._wiki_values(mob_proto, vnums)
+        pages = self.registry.pages_from_vnums(wiki_values)
+
+        for page in Pages(self.metin2wiki, pages).iter_content(parse=True):
+            entity_page = self._entity_page(page)
+
+            if entity_page is not None and entity_page.vnum in wiki_values:
+                self._update_page(entity_page, wiki_values[entity_page.vnum])
+                yield entity_page
+
+    def run(
+        self,
+        previous: GameProto,
+        current: GameProto | None = None,
+        summary=SUMMARY,
+        refresh_registry: bool = True,
+    ):
+        current = current or GameProto()
+        mob_proto = self.mob_proto or MobProto(
+            cache=current.cache, path=current.mob_path
+        )
+        vnums = self.changed_vnums(previous, current)
+
+        if refresh_registry:
+            self.registry.refresh(self.CATEGORIES)
+
+        return self.metin2wiki.bulk_edit(
+            self._updated_pages(mob_proto, vnums), summary=summary
+        )
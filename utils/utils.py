@@ -1,6 +1,32 @@
+import hashlib
+from collections import deque
+from contextvars import copy_context
+
+
 def data_slicing(data, size):
 
     if not isinstance(data, list):
         data = list(data)
 
-    return [data[index : index + size] for index in range(0, len(data), size)]
\ No newline at end of file
+    return [data[index : index + size] for index in range(0, len(data), size)]
+
+
+def bounded_map(executor, function, data, size):
+
+    futures = deque()
+
+    for element in data:
+        if len(futures) >= size:
+            yield futures.popleft().result()
+        futures.append(executor.submit(copy_context().run, function, element))
+
+    while futures:
+        yield futures.popleft().result()
+
+
+def text_hash(text: str | None) -> str | None:
+
+    if text is None:
+        return None
+
+    return hashlib.sha1(text.encode()).hexdigest()